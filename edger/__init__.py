@@ -0,0 +1,1937 @@
+import bpy
+import bmesh
+import mathutils
+import bgl
+import array
+import zlib
+import time
+from bpy_extras.view3d_utils import location_3d_to_region_2d
+from bpy_extras.io_utils import ExportHelper
+try: import numpy as np
+except ImportError: np = None
+from .core import FindAllCyclicLoops, FindCyclicLoops, SortGroupVertsByAdjacent, GroupName, \
+     GetAdjInfos, AdjInfoForVertex, AdjacentVerts, BuildRecordTable, LockVertsOnEdge, SettleVertsOnEdge, OrderRecords, BuildLockSolver, ProjectToRegion, \
+     GetVertsCo, GetVertLookup, MeshTopology, FindLockableLoops, OpenClosedChains, CrossFaceLoops, DataLerp, \
+     IndexTargetRecords, DeselectTargets, SelectEnds, TraceWriter, CoordMirror, LoopBounds, TRACE_REINIT, TRACE_TOPOLOGY, TRACE_LOOPS, profiler, Profiled
+
+bl_info = {
+    "name": "Edger",
+    "author": "Reslav Hollos",
+    "version": (0, 3, 6),
+    "blender": (2, 72, 0),
+    "description": "Lock vertices on \"edge\" they lay, make unselectable edge loops for subdivision",
+    "warning": "",
+#    "wiki_url": "",
+    "category": "Mesh"
+}
+
+#TODO noncyclics get drawed when Edger is unregistered
+#TODO when groups are added/deleted ReInit
+#TODO reinit on history change
+#TODO try alt rmb shortcut to deactivate so verts dont deselect
+#TODO moving and canceling with RMB spawns shadows
+#TODO detect group from selected and remove via button
+
+def GetMeshTopology(bm):
+    """MeshTopology of bm read in bulk through a temporary mesh, None without numpy or on 3+ faces per edge"""
+    if np is None:
+        return None
+    bm.verts.index_update()
+    bm.edges.index_update()
+    temp = bpy.data.meshes.new("_edger_topology_")
+    try:
+        bm.to_mesh(temp)
+        co = np.empty(len(temp.vertices)*3, dtype=np.float64)
+        edgeVerts = np.empty(len(temp.edges)*2, dtype=np.int32)
+        loopVerts = np.empty(len(temp.loops), dtype=np.int32)
+        loopEdges = np.empty(len(temp.loops), dtype=np.int32)
+        faceStarts = np.empty(len(temp.polygons), dtype=np.int32)
+        faceSizes = np.empty(len(temp.polygons), dtype=np.int32)
+        temp.vertices.foreach_get("co", co)
+        temp.edges.foreach_get("vertices", edgeVerts)
+        temp.loops.foreach_get("vertex_index", loopVerts)
+        temp.loops.foreach_get("edge_index", loopEdges)
+        temp.polygons.foreach_get("loop_start", faceStarts)
+        temp.polygons.foreach_get("loop_total", faceSizes)
+    finally:
+        bpy.data.meshes.remove(temp)
+    
+    topology = MeshTopology(len(bm.verts), edgeVerts, loopVerts, loopEdges, faceStarts, faceSizes, co)
+    return topology if topology.isSupported else None
+
+@Profiled("RefineGroups", lambda result, storage, bm, groupVerts, *args: len(groupVerts))
+def RefineGroups(storage, bm, groupVerts, batched = False):
+    #same rings as the bmesh walker, found on index arrays instead of one loop at a time
+    topology = GetMeshTopology(bm) if batched else None
+    if topology is not None:
+        allGroups = topology.FindAllCyclicLoops(groupVerts, GetVertLookup(bm))
+    else: allGroups = FindAllCyclicLoops(groupVerts)
+    
+    allVertsOld, allVertsNew = set(), set()
+    for g in groupVerts: allVertsOld.update(groupVerts[g])
+    for verts in allGroups: allVertsNew.update(verts)
+    nonCyclicVerts = list(allVertsOld -allVertsNew)
+
+    storage.RemoveAll(bm, groupVerts)
+    
+    for verts in allGroups:
+        storage.AddLoop(bm, verts)
+    
+    #ncName = "_noncyclics_edger_"
+    #nc = GetGroupByName(ncName)
+    #if nc: 
+    #    nonCyclicVerts += GetSpecificGroupVerts(obj, bm, nc)
+    #    DeleteGroup(obj, nc)
+    
+    #nc = AddNewVertexGroup(ncName)
+    #AddVertsToGroup(bm, nonCyclicVerts, nc)
+    #noncyclics = nonCyclicVerts
+
+def GetSpecificGroupVerts(obj, bm, g):
+    verts = []
+    deform_layer = GetDeformLayer(bm)
+    for v in bm.verts:
+        if g.index in v[deform_layer]:
+            verts.append(v)
+    return verts
+
+def GetGroupVerts(obj, bm):
+    groupVerts = {}
+    if obj and bm:
+        #deform index -> group, built once so each vertex only looks up groups it carries
+        byIndex = {}
+        for g in obj.vertex_groups:
+            if g.name.startswith("_edger_"):
+                groupVerts[g] = []
+                byIndex[g.index] = groupVerts[g]
+        
+        nc = obj.vertex_groups.get("_noncyclics_edger_")
+        ncCount = [0]
+        if nc:
+            byIndex[nc.index] = ncCount
+        
+        deform_layer = GetDeformLayer(bm)
+        
+        deletion = []
+        
+        for v in bm.verts:
+            for i in v[deform_layer].keys():
+                verts = byIndex.get(i)
+                if verts is None:
+                    continue
+                if verts is ncCount:
+                    ncCount[0] += 1
+                else: verts.append(v)
+        
+        for g in groupVerts:
+            if len(groupVerts[g]) is 0:
+                deletion.append(g)
+        
+        #delete empty
+        groupVerts = {k: v for k, v in groupVerts.items() if len(v) is not 0}
+        DeleteGroups(obj, deletion)
+        if nc and ncCount[0] is 0:
+            DeleteGroup(obj, nc)
+            
+    return groupVerts    
+
+def DeleteGroups(obj, groups):
+    for g in groups: DeleteGroup(obj, g)
+
+def DeleteGroup(obj, g):
+    obj.vertex_groups.remove(g)    
+    
+def AddNewVertexGroup(name):
+    #TODO make check if selected are already part of _edger_ group
+    try: bpy.context.object.vertex_groups[groupName]
+    except: return bpy.context.object.vertex_groups.new(name)
+    return None
+
+def SelectionSignature(me, bm):
+    """Cheap key that changes with (almost) every selection edit"""
+    return me.total_vert_sel, bm.select_history.active
+
+def NewlySelected(bm, signature):
+    """Indices of vertices selected since selectionSignature, None when that can't be told cheaply
+    
+    Clicking puts what it selects in the select history, a click alone
+    leaves just the active vertex selected. Box, all and other selections
+    don't say what they added and get every target checked.
+    """
+    if selectionSignature is None:
+        return None
+    count, active = signature
+    if count == 1 and isinstance(active, bmesh.types.BMVert) and active.select:
+        return [active.index]
+    added = count -selectionSignature[0]
+    if added <= 0:
+        return None
+    history = list(bm.select_history)[-added:]
+    if len(history) != added or not all(isinstance(v, bmesh.types.BMVert) and v.select for v in history):
+        return None
+    return [v.index for v in history]
+
+#def DeselectGroupsSelectCloser(adjInfos):
+@Profiled("DeselectGroups")
+def DeselectGroups(me, bm):
+    """Moves selection off locked targets to their nearer end, skipped while selection is unchanged
+    
+    No target is left selected after a pass, so only vertices selected
+    since need checking when NewlySelected can tell them.
+    """
+    global selectionSignature
+    signature = SelectionSignature(me, bm)
+    if signature == selectionSignature:
+        return False
+    
+    redirected = DeselectTargets(recordTable.refs, targetRecords, NewlySelected(bm, signature))
+    SelectEnds(recordTable.refs, redirected)
+    #redirecting changed the selection too
+    selectionSignature = SelectionSignature(me, bm) if len(redirected) > 0 else signature
+    return len(redirected) > 0
+
+@Profiled("LockAllVerts", lambda written, *args: written)
+def LockAllVerts(context, adjInfos):
+    if lockSolver is not None:
+        #per vertex still only locks the records whose ends moved
+        written = lockSolver.Solve(recordTable.refs, None if context.scene.isEdgerVectorized else adjInfos)
+        levels = lockSolver.solved
+    else:
+        LockVertsOnEdge(solveOrder)
+        if solveCyclic > 0:
+            SettleVertsOnEdge(solveOrder[len(solveOrder) -solveCyclic:])
+        written = len(solveOrder)
+        levels = []
+    if dataLerp is not None:
+        dataLerp.Apply(levels)
+    return written
+
+def UvAccess(layer):
+    def Read(loops):
+        return np.array([l[layer].uv[:] for l in loops], dtype=np.float64).reshape(len(loops), 2)
+    def Write(loops, values):
+        for l, uv in zip(loops, values.tolist()):
+            l[layer].uv = uv
+    return Read, Write
+
+def ColorAccess(layer):
+    def Read(loops):
+        return np.array([l[layer][:] for l in loops], dtype=np.float64).reshape(len(loops), -1)
+    def Write(loops, values):
+        for l, color in zip(loops, values.tolist()):
+            l[layer] = color
+    return Read, Write
+
+def WeightAccess(layer, groups):
+    """Weights of groups as dense rows, zero where a vertex isn't in a group"""
+    def Read(verts):
+        return np.array([[dv.get(g, 0.0) for g in groups] for dv in (v[layer] for v in verts)], dtype=np.float64).reshape(len(verts), len(groups))
+    def Write(verts, values):
+        for v, row in zip(verts, values.tolist()):
+            dv = v[layer]
+            for g, w in zip(groups, row):
+                #don't add targets to groups none of its ends have weight in
+                if w > 0.0 or g in dv:
+                    dv[g] = w
+    return Read, Write
+
+def BuildDataLerp(scene, obj, bm, records, lerp = None):
+    """DataLerp of layers picked in edgerLerpData for records, None if nothing is picked or without numpy
+    
+    Given lerp, records are new ones appended to it instead.
+    """
+    kinds = scene.edgerLerpData
+    if np is None or len(kinds) is 0 or (lerp is None and len(records) is 0):
+        return lerp
+    if lerp is None:
+        lerp = DataLerp([])
+    first = lerp.Extend(records)
+    deform = bm.verts.layers.deform.active
+    if 'WEIGHT' in kinds and deform is not None:
+        #_edger_ groups hold loops, not weights
+        own = set(g.index for g in obj.vertex_groups if g.name.startswith("_edger_"))
+        used = set(lerp.layers.get('WEIGHT') or ())
+        for i in records:
+            used.update(i.end1[deform].keys(), i.end2[deform].keys(), i.target[deform].keys())
+        groups = sorted(used -own)
+        if len(groups) > 0:
+            lerp.AddChannel('WEIGHT', range(first, first +len(records)), [i.target for i in records], [i.end1 for i in records],
+                            [i.end2 for i in records], *WeightAccess(deform, groups), layer = groups)
+    
+    access = []
+    if 'UV' in kinds:
+        access += [(('UV', layer.name),) +UvAccess(layer) for layer in bm.loops.layers.uv.values()]
+    if 'COLOR' in kinds:
+        access += [(('COLOR', layer.name),) +ColorAccess(layer) for layer in bm.loops.layers.color.values()]
+    crossed = [(first +k,) +c for k, i in enumerate(records) for c in CrossFaceLoops(i)] if access else []
+    for key, read, write in access:
+        if len(crossed) is 0:
+            break
+        #a seam along the loop splits the target's values, faces there keep theirs
+        joined = (np.abs(read([c[1] for c in crossed]) -read([c[4] for c in crossed])) <= 1e-6).all(axis=1).tolist()
+        kept = [c for c, j in zip(crossed, joined) if j]
+        lerp.AddChannel(key, [c[0] for c in kept], [c[1] for c in kept], [c[2] for c in kept], [c[3] for c in kept], read, write)
+    return lerp
+
+def RemoveDataLerp(lerp, bm, first, count, removedGroup = None):
+    """Drops records first to first +count from lerp, removedGroup is the deform index of a vertex group just deleted"""
+    if lerp is None:
+        return
+    lerp.RemoveRange(first, count)
+    groups = lerp.layers.get('WEIGHT')
+    if removedGroup is None or groups is None:
+        return
+    #deleting a group shifts deform indices of the ones after it
+    groups = [g -1 if g > removedGroup else g for g in groups if g != removedGroup]
+    lerp.layers['WEIGHT'] = groups
+    if 'WEIGHT' in lerp.channels:
+        lerp.channels['WEIGHT'][4:] = WeightAccess(bm.verts.layers.deform.active, groups)
+
+def GetDeformLayer(bm):
+    deform_layer = bm.verts.layers.deform.active
+    if deform_layer is None: 
+        return bm.verts.layers.deform.new()
+    return deform_layer
+     
+def RemoveVertsFromGroup(bm, verts, g):
+    if g is None: return 
+    deform_layer = GetDeformLayer(bm)
+    for v in verts:
+        del v[deform_layer][g.index]
+
+def AddVertsToGroup(bm, verts, g):
+    deform_layer = GetDeformLayer(bm)
+    for v in verts:
+        v[deform_layer][g.index] = 1     #set weight to 1 as usual default
+    
+def AddSelectedToGroup(bm, g):
+    deform_layer = GetDeformLayer(bm)
+    for v in bm.verts:
+        if v.select is True:
+            v[deform_layer][g.index] = 1     #set weight to 1 as usual default
+
+def GetGroupByName(name):
+    try: return bpy.context.object.vertex_groups[name]
+    except: return None
+
+class GroupLoopStorage(object):
+    """Every loop is its own _edger_ vertex group, loops are keyed by group"""
+    def __init__(self, obj):
+        self.obj = obj
+        
+    def GetLoops(self, bm):
+        return GetGroupVerts(self.obj, bm)
+    
+    def AddLoop(self, bm, verts):
+        g = self.obj.vertex_groups.new("_edger_")
+        AddVertsToGroup(bm, verts, g)
+        return g
+    
+    def RemoveLoop(self, bm, g, verts):
+        DeleteGroup(self.obj, g)
+        
+    def RemoveAll(self, bm, loops):
+        DeleteGroups(self.obj, list(loops))
+    
+    def StripMesh(self, bm):
+        pass
+    
+    def StripObject(self, dup):
+        for g in [g for g in dup.vertex_groups if g.name.startswith("_edger_")]:
+            dup.vertex_groups.remove(g)
+
+class LayerLoopStorage(object):
+    """Loop ids in int vertex layers, loops are keyed by id
+    
+    0 is no loop, a vertex keeps the id of its first loop in layerName and
+    those of loops crossing there in layerName.1, layerName.2 and so on.
+    Membership lives in mesh data so edit mode undo restores it with the
+    mesh, the object only keeps the next free id.
+    """
+    layerName = "_edger_loop_id"
+    registryName = "_edger_loops"
+    
+    def __init__(self, obj):
+        self.obj = obj
+        if self.registryName not in obj:
+            obj[self.registryName] = {"next": 1}
+        self.registry = obj[self.registryName]
+    
+    def Layers(self, bm, count = 1):
+        """Id layers of bm in order, new ones are added until there are count"""
+        ints = bm.verts.layers.int
+        layers = []
+        while True:
+            name = self.layerName if len(layers) is 0 else self.layerName +"." +str(len(layers))
+            layer = ints.get(name)
+            if layer is None:
+                if len(layers) >= count:
+                    return layers
+                layer = ints.new(name)
+            layers.append(layer)
+    
+    def GetLoops(self, bm):
+        layers = self.Layers(bm)
+        loops = {}
+        for v in bm.verts:
+            for layer in layers:
+                i = v[layer]
+                if i > 0:
+                    if i in loops:
+                        loops[i].append(v)
+                    else: loops[i] = [v]
+        #oldest loop first like vertex groups
+        return dict((i, loops[i]) for i in sorted(loops))
+    
+    def AddLoop(self, bm, verts):
+        layers = self.Layers(bm)
+        i = self.registry["next"]
+        self.registry["next"] = i +1
+        for v in verts:
+            free = [layer for layer in layers if v[layer] is 0]
+            if len(free) is 0:
+                layers = self.Layers(bm, len(layers) +1)
+                free = layers[-1:]
+            v[free[0]] = i
+        return i
+    
+    def RemoveLoop(self, bm, i, verts):
+        layers = self.Layers(bm)
+        for v in verts:
+            for layer in layers:
+                if v[layer] == i:
+                    v[layer] = 0
+    
+    def RemoveAll(self, bm, loops):
+        layers = self.Layers(bm)
+        for i in loops:
+            for v in loops[i]:
+                for layer in layers:
+                    v[layer] = 0
+    
+    def StripMesh(self, bm):
+        #by name, removing a layer moves the ones after it
+        for name in [layer.name for layer in self.Layers(bm, 0)]:
+            bm.verts.layers.int.remove(bm.verts.layers.int[name])
+    
+    def StripObject(self, dup):
+        if self.registryName in dup:
+            del dup[self.registryName]
+
+def GetLoopStorage(scene, obj, bm):
+    """Layer storage once an object has a registry or the scene asks for it, groups are migrated to it once"""
+    if LayerLoopStorage.registryName not in obj and scene.edgerStorage != 'LAYER':
+        return GroupLoopStorage(obj)
+    
+    storage = LayerLoopStorage(obj)
+    if any(g.name.startswith("_edger_") for g in obj.vertex_groups):
+        MigrateGroupsToLayer(obj, bm, storage)
+    return storage
+
+def MigrateGroupsToLayer(obj, bm, storage):
+    groupVerts = GetGroupVerts(obj, bm)
+    for g in groupVerts:
+        storage.AddLoop(bm, groupVerts[g])
+    DeleteGroups(obj, list(groupVerts))
+    for g in [g for g in obj.vertex_groups if g.name.startswith("_edger_")]:
+        DeleteGroup(obj, g)
+    print("Edger: moved " +str(len(groupVerts)) +" loops from vertex groups to " +LayerLoopStorage.layerName)
+
+#display lists are compiled once and replayed with a single call, else fall back to projecting every frame
+isOverlayBatched = hasattr(bgl, "glGenLists")
+
+class LoopOverlay(object):
+    """Loop lines in object space, compiled only after loops changed or moved
+    
+    With numpy loops out of view are left out and small ones decimated by
+    LoopBounds, the list is compiled again when that changes with the view.
+    """
+    def __init__(self):
+        self.displayList = None
+        self.dirty = True
+        self.bounds = None      #LoopBounds of the loops, None until drawn after a change
+        self.strides = None     #LoopBounds.Strides the list was compiled with
+        self.vertCount = 0     #vertices sent to GL in last frame
+        self.drawCalls = 0     #draw calls issued in last frame
+        self.loopsDrawn = 0    #loops in view in last frame
+        
+    def Tag(self):
+        self.dirty = True
+        self.bounds = None
+    
+    def Strides(self, obj, groupVerts):
+        """LoopBounds.Strides of groupVerts in the region drawn last, None without numpy"""
+        if np is None or regionView is None:
+            self.loopsDrawn = len(groupVerts)
+            return None
+        if self.bounds is None:
+            self.bounds = LoopBounds([groupVerts[g] for g in groupVerts])
+        strides = self.bounds.Strides(ObjectToRegionMatrix(obj), *regionView[1:])
+        self.loopsDrawn = int(np.count_nonzero(strides))
+        return strides
+        
+    def Compile(self, groupVerts, remainders, strides = None):
+        #coords are read before the list is opened, a freed vertex raises with GL state untouched
+        lines = []
+        if strides is None:
+            for g in groupVerts:
+                co = [v.co[:] for v in groupVerts[g]]
+                lines += [c for pair in zip([co[-1]] +co[:-1], co) for c in pair]
+        else:
+            for k in (strides > 0).nonzero()[0].tolist():
+                co = self.bounds.Loop(k, strides[k]).tolist()
+                lines += [c for pair in zip([co[-1]] +co[:-1], co) for c in pair]
+        centers = [] if strides is None else self.bounds.centers[strides < 0].tolist()
+        points = [v.co[:] for g in remainders for v in remainders[g]]
+        
+        if self.displayList is None:
+            self.displayList = bgl.glGenLists(1)
+        bgl.glNewList(self.displayList, bgl.GL_COMPILE)
+        bgl.glLineWidth(2)
+        bgl.glColor4f(0.5, 0.1, 0.1, 0.5)
+        bgl.glBegin(bgl.GL_LINES)
+        for c in lines:
+            bgl.glVertex3f(*c)
+        bgl.glEnd()
+        
+        if len(centers) > 0:
+            bgl.glPointSize(3)
+            bgl.glBegin(bgl.GL_POINTS)
+            for c in centers:
+                bgl.glVertex3f(*c)
+            bgl.glEnd()
+        
+        bgl.glPointSize(5)
+        bgl.glColor4f(0.1, 0.1, 0.5, 0.6)
+        bgl.glBegin(bgl.GL_POINTS)
+        for c in points:
+            bgl.glVertex3f(*c)
+        bgl.glEnd()
+        bgl.glEndList()
+        
+        count = len(lines) +len(centers) +len(points)
+        self.vertCount = count
+        self.strides = strides
+        self.dirty = False
+        
+    def Draw(self, obj, groupVerts, remainders):
+        strides = self.Strides(obj, groupVerts)
+        #orbiting with the same loops in view and detail replays the list as is
+        if self.dirty or (strides is not None and (self.strides is None or not np.array_equal(strides, self.strides))):
+            self.Compile(groupVerts, remainders, strides)
+        
+        mw = obj.matrix_world
+        bgl.glPushMatrix()
+        bgl.glMultMatrixf(bgl.Buffer(bgl.GL_FLOAT, 16, [mw[j][i] for i in range(4) for j in range(4)]))
+        isDepth = bgl.glIsEnabled(bgl.GL_DEPTH_TEST)
+        bgl.glDisable(bgl.GL_DEPTH_TEST)
+        bgl.glEnable(bgl.GL_BLEND)
+        
+        bgl.glCallList(self.displayList)
+        self.drawCalls = 1
+        
+        bgl.glDisable(bgl.GL_BLEND)
+        if isDepth:
+            bgl.glEnable(bgl.GL_DEPTH_TEST)
+        bgl.glPopMatrix()
+        #restore defaults
+        bgl.glLineWidth(1)
+        bgl.glPointSize(1)
+        bgl.glColor4f(0.0, 0.0, 0.0, 1.0)
+        
+    def Free(self):
+        if self.displayList is not None:
+            bgl.glDeleteLists(self.displayList, 1)
+            self.displayList = None
+        self.dirty = True
+
+loopOverlay = LoopOverlay()
+
+@Profiled("draw_callback_view", lambda result, *args: loopOverlay.vertCount)
+def draw_callback_view(self, context):
+    edgerSchedule.redrawn = True
+    if context.scene.isEdgerRunning is False or \
+       context.scene.isEdgerDebugActive is False:
+        return
+    #groupVerts belong to obj that ReInit was last called for
+    StoreRegionView(context)
+    try:
+        if obj is not None and obj.mode == "EDIT":
+            loopOverlay.Draw(obj, groupVerts, groupRemainders)
+    #verts got freed before modal had a chance to ReInit, draw next frame
+    except ReferenceError: loopOverlay.Tag()
+    for state in meshStates.values():
+        try:
+            if state["obj"] is not None and state["obj"].mode == "EDIT":
+                state["loopOverlay"].Draw(state["obj"], state["groupVerts"], state["groupRemainders"])
+        except ReferenceError: state["loopOverlay"].Tag()
+
+@Profiled("draw_callback_px", lambda result, *args: loopOverlay.vertCount)
+def draw_callback_px(self, context):
+    #if context.object and context.object.mode is not "EDIT":
+    #    return
+    edgerSchedule.redrawn = True
+    if context.scene.isEdgerRunning is False or \
+       context.scene.isEdgerDebugActive is False:
+        return
+    
+    loopOverlay.vertCount = 0
+    loopOverlay.drawCalls = 0
+    StoreRegionView(context)
+    
+    #draw noncyclics
+    #global noncyclics
+    #verts2d = Get2dFrom3dVerts(context, noncyclics)
+    #DrawByVertices("points", verts2d, [0.1, 0.1, 0.5, 0.6])
+    
+    for g in groupRemainders:
+        verts2d = Get2dFrom3dVerts(context, groupRemainders[g])
+        DrawByVertices("points", verts2d, [0.1, 0.1, 0.5, 0.6])
+    
+    try: strides = loopOverlay.Strides(obj, groupVerts)
+    except ReferenceError: return
+    if strides is None:
+        for g in groupVerts:
+            verts2d = Get2dFrom3dVerts(context, groupVerts[g])
+            DrawByVertices("lines", verts2d, [0.5, 0.1, 0.1, 0.5])
+        return
+    
+    #only loops in view get projected, from coordinates read when they last moved
+    bounds = loopOverlay.bounds
+    matrix = ObjectToRegionMatrix(obj)
+    for k in (strides > 0).nonzero()[0].tolist():
+        co2d, visible = ProjectToRegion(bounds.Loop(k, strides[k]), matrix, *regionView[1:])
+        DrawByVertices("lines", co2d[visible].tolist(), [0.5, 0.1, 0.1, 0.5])
+    if (strides < 0).any():
+        co2d, visible = ProjectToRegion(bounds.centers[strides < 0], matrix, *regionView[1:])
+        DrawByVertices("points", co2d[visible].tolist(), [0.5, 0.1, 0.1, 0.5])
+
+#perspective_matrix and size of the 3d view region drawn last, (matrix, width, height)
+regionView = None
+
+def StoreRegionView(context):
+    global regionView
+    if np is None:
+        return
+    rv3d = context.space_data.region_3d
+    regionView = (np.array(rv3d.perspective_matrix), context.region.width, context.region.height)
+
+def ObjectToRegionMatrix(obj):
+    return np.dot(regionView[0], np.array(obj.matrix_world))
+
+def Get2dFrom3dVerts(context, verts3d):
+    if np is not None:
+        try: co = GetVertsCo(verts3d)
+        except ReferenceError: return []
+        co2d, visible = ProjectToRegion(co, ObjectToRegionMatrix(obj), *regionView[1:])
+        return co2d[visible].tolist()
+    
+    verts2d =[]
+    for v in verts3d:
+        try: 
+            v_worldCo = obj.matrix_world*v.co
+            new2dCo = location_3d_to_region_2d(context.region, context.space_data.region_3d, v_worldCo)
+            verts2d.append([new2dCo.x,new2dCo.y])
+        #TODO multiple registered instances when running SCRIPT, qfix:restart blender 
+        except: continue
+
+    return verts2d
+
+def DrawByVertices(mode, verts2d, color):
+    bgl.glColor4f(*color)
+    
+    bgl.glEnable(bgl.GL_BLEND)
+    
+    if mode is "points":
+        bgl.glPointSize(5)
+        bgl.glBegin(bgl.GL_POINTS)
+            
+    elif mode is "lines":
+        bgl.glLineWidth(2)
+        bgl.glBegin(bgl.GL_LINE_LOOP)
+    
+    for x, y in verts2d:
+        bgl.glVertex2f(x, y)
+    loopOverlay.vertCount += len(verts2d)
+    loopOverlay.drawCalls += 1
+
+    bgl.glEnd()
+    bgl.glDisable(bgl.GL_BLEND)
+    #restore defaults
+    bgl.glLineWidth(1)
+    bgl.glColor4f(0.0, 0.0, 0.0, 1.0)
+
+    return
+
+cacheName = "_edger_cache"
+
+def TopologyFingerprint(counts, groupIndices):
+    """Cheap key telling if loops cached for this mesh are still valid
+    
+    counts are of vertices, edges and faces, groupIndices pairs of a group
+    and the vertex indices in it.
+    """
+    crc = 0
+    for g, indices in groupIndices:
+        crc = zlib.crc32(GroupName(g).encode(), crc)
+        #membership only, groups get scanned in vertex order but cached in loop order
+        crc = zlib.crc32(array.array('i', sorted(indices)).tobytes(), crc)
+    return "%d %d %d %08x" % (counts[0], counts[1], counts[2], crc)
+
+def MeshFingerprint(bm, groupVerts):
+    """TopologyFingerprint of an edit mesh"""
+    bm.verts.index_update()
+    counts = len(bm.verts), len(bm.edges), len(bm.faces)
+    return TopologyFingerprint(counts, ((g, [v.index for v in groupVerts[g]]) for g in groupVerts))
+
+def SaveTopologyCache(obj, counts, groups, loopIndices, table):
+    """Stores ordered loops and lock records on obj as one int blob
+    
+    Only indices are read so it can be written after the bmesh is gone,
+    loopIndices[g] = (loop, remainder) vertex indices of each of groups.
+    """
+    fingerprint = TopologyFingerprint(counts, ((g, loopIndices[g][0] +loopIndices[g][1]) for g in groups))
+    
+    slots = {}
+    ints = array.array('i', [len(groups)])
+    for g in groups:
+        slots[g] = len(slots)
+        ints.append(len(loopIndices[g][0]))
+        ints.append(len(loopIndices[g][1]))
+    for g in groups:
+        ints.extend(loopIndices[g][0])
+        ints.extend(loopIndices[g][1])
+    
+    ints.append(len(table))
+    for t, e1, e2, g in zip(table.targets, table.ends1, table.ends2, table.loops):
+        ints.extend((t, e1, e2, slots[g]))
+    
+    obj[cacheName] = {"fingerprint": fingerprint, "blob": ints.tobytes()}
+
+def LoadTopologyCache(obj, bm, groupVerts):
+    """Orders groupVerts from cache, returns (remainders, adjInfos) or None if mesh changed"""
+    cache = obj.get(cacheName)
+    if cache is None or cache.get("fingerprint") != MeshFingerprint(bm, groupVerts):
+        return None
+    
+    verts = GetVertLookup(bm)
+    groups = list(groupVerts)
+    remainders, adjInfos = {}, []
+    try:
+        ints = array.array('i')
+        ints.frombytes(bytes(cache["blob"]))
+        ints = ints.tolist()
+        
+        if ints[0] != len(groups):
+            return None
+        lengths = ints[1:1 +2*len(groups)]
+        p = 1 +2*len(groups)
+        for k, g in enumerate(groups):
+            loopLen, remLen = lengths[2*k], lengths[2*k +1]
+            groupVerts[g] = [verts[i] for i in ints[p:p +loopLen]]
+            p += loopLen
+            if remLen > 0:
+                remainders[g] = [verts[i] for i in ints[p:p +remLen]]
+                p += remLen
+        
+        count = ints[p]
+        p += 1
+        for r in range(p, p +4*count, 4):
+            t, e1, e2, slot = ints[r:r +4]
+            target, end1, end2 = verts[t], verts[e1], verts[e2]
+            #the fingerprint misses edits that keep counts, ends have to still be neighbours
+            adjacent = AdjacentVerts(target)
+            if end1 not in adjacent or end2 not in adjacent:
+                return None
+            adjInfos.append(AdjInfoForVertex(target, end1, end2, groups[slot]))
+    except (IndexError, ValueError, KeyError):
+        return None
+    
+    return remainders, adjInfos
+
+def SaveStaleCache(state):
+    """Writes the topology cache of state (globals() or one of meshStates) if its loops changed since
+    
+    Locking and unlocking only mark it stale, it is written once before the
+    bmesh goes: leaving edit mode, undo, saving the file or stopping Edger.
+    """
+    if state["cacheStale"] is False or state["recordTable"] is None:
+        return
+    state["cacheStale"] = False
+    obj, bm = state["obj"], state["bm"]
+    if bm is not None and bm.is_valid:
+        counts = len(bm.verts), len(bm.edges), len(bm.faces)
+    #left edit mode, the mesh has vertices in the order the bmesh had
+    else: counts = len(obj.data.vertices), len(obj.data.edges), len(obj.data.polygons)
+    #topology edited after the last pass, indices don't hold any more
+    if counts[0] != state["recordTable"].vertCount:
+        return
+    SaveTopologyCache(obj, counts, state["groupVerts"], state["loopIndices"], state["recordTable"])
+
+#INIT
+@Profiled("ReInit", lambda result, *args: len(adjInfos))
+def ReInit(context = None, target = None):
+    """Rebuilds state of target (context.object by default) and makes it the one in the globals"""
+    global obj, me, bm
+    global groupVerts, groupRemainders, adjInfos, recordTable, lockSolver, vertLoops, loopRecords, cacheStale
+    global loopStorage, loopIndices, targetRecords, selectionSignature, livePreview
+    if context is None:
+        context = bpy.context
+    if target is None:
+        target = context.object
+    SwitchState(target)
+    obj = target
+    me = obj.data
+    bm = bmesh.from_edit_mesh(me)
+    #left by undo, its indices still tell if the new bmesh has the same loops
+    SaveStaleCache(globals())
+    
+    loopStorage = GetLoopStorage(context.scene, obj, bm)
+    groupVerts = loopStorage.GetLoops(bm)
+    
+    #same topology and groups as last time, skip refining and sorting
+    cached = LoadTopologyCache(obj, bm, groupVerts)
+    if cached is not None:
+        groupRemainders, adjInfos = cached
+    else:
+        RefineGroups(loopStorage, bm, groupVerts, context.scene.isEdgerVectorized)
+        groupVerts = loopStorage.GetLoops(bm)
+        groupRemainders = SortGroupVertsByAdjacent(groupVerts)
+        adjInfos = GetAdjInfos(groupVerts, groupRemainders)
+    recordTable = BuildRecordTable(bm, adjInfos)
+    cacheStale = cached is None
+    lockSolver = BuildLockSolver(recordTable, recordTable.refs)
+    
+    vertLoops, loopRecords, loopIndices = {}, {}, {}
+    targetRecords = IndexTargetRecords({}, recordTable)
+    selectionSignature = None
+    for g in groupVerts:
+        IndexLoopVerts(g)
+    IndexLoopRecords(adjInfos)
+    UpdateSolveOrder()
+    UpdateDataLerp(context.scene)
+    if livePreview is None:
+        livePreview = AttachedPreview(context, obj)
+    loopOverlay.Tag()
+
+def UpdateSolveOrder():
+    """solveOrder of the per-vertex path, LockSolver keeps its own order up to date"""
+    global solveOrder, solveCyclic
+    if lockSolver is None:
+        solveOrder, solveCyclic = OrderRecords(adjInfos)
+    else: solveOrder, solveCyclic = [], lockSolver.cyclic
+
+def UpdateDataLerp(scene):
+    global dataLerp
+    dataLerp = BuildDataLerp(scene, obj, bm, adjInfos)
+
+def IndexLoopRecords(records):
+    for i in records:
+        if i.loop in loopRecords:
+            loopRecords[i.loop].append(i)
+        else: loopRecords[i.loop] = [i]
+
+def IndexLoopVerts(g):
+    """vertLoops and loopIndices of group g, vertex indices have to be up to date"""
+    loopIndices[g] = ([v.index for v in groupVerts[g]], [v.index for v in groupRemainders.get(g, [])])
+    for v in groupVerts[g] + groupRemainders.get(g, []):
+        if v in vertLoops:
+            vertLoops[v].append(g)
+        else: vertLoops[v] = [g]
+
+def EnsureInit(context):
+    """ReInit unless state kept for context.object still belongs to its edit mesh"""
+    SwitchState(context.object)
+    if not RecordsAreValid(context.object, bmesh.from_edit_mesh(context.object.data)):
+        ReInit(context)
+
+def RecordsAreValid(target, editBm, full = True):
+    """Bulk check that lock records still belong to the edit mesh of target, before a pass uses them
+    
+    Unless full only the vertex count is compared, enough for passes
+    no mesh update came before.
+    """
+    #undo and leaving edit mode hand out a new bmesh, topology edits free and move vertices
+    if recordTable is None or obj != target or editBm != bm or not bm.is_valid:
+        return False
+    return recordTable.IsValid(GetVertLookup(bm) if full else bm.verts, full)
+
+def LoopsOfVerts(verts):
+    """Groups that own every one of verts, in groupVerts order"""
+    if len(verts) is 0:
+        return []
+    owners = set(vertLoops.get(verts[0], []))
+    for v in verts:
+        if len(owners) is 0:
+            break
+        owners.intersection_update(vertLoops.get(v, []))
+    return [g for g in vertLoops.get(verts[0], []) if g in owners]
+
+def AddLockedLoops(obj, bm, verts):
+    """Locks cyclic loops found among verts without touching other loops, returns new groups"""
+    loops = []
+    for loop in FindCyclicLoops(verts):
+        #already locked, refining would have merged it
+        if any(len(groupVerts[g]) +len(groupRemainders.get(g, [])) == len(loop) for g in LoopsOfVerts(list(loop))):
+            continue
+        loops.append(loop)
+    return LockLoops(obj, bm, loops)
+
+def LockLoops(obj, bm, loops):
+    """Adds loops (collections of verts) as new groups and their records in one go, returns new groups"""
+    global cacheStale, selectionSignature, dataLerp
+    added = []
+    for loop in loops:
+        g = loopStorage.AddLoop(bm, loop)
+        groupVerts[g] = sorted(loop, key = lambda v: v.index)
+        added.append(g)
+    if len(added) is 0:
+        return added
+    
+    newGroups = dict((g, groupVerts[g]) for g in added)
+    remainders = SortGroupVertsByAdjacent(newGroups)
+    groupVerts.update(newGroups)
+    groupRemainders.update(remainders)
+    records = GetAdjInfos(newGroups, remainders)
+    adjInfos.extend(records)
+    bm.verts.index_update()
+    first = len(recordTable)
+    recordTable.Extend(records)
+    IndexLoopRecords(records)
+    IndexTargetRecords(targetRecords, recordTable, first)
+    if lockSolver is not None:
+        lockSolver.AddRecords(recordTable, recordTable.refs, first)
+    
+    for g in added:
+        IndexLoopVerts(g)
+    UpdateSolveOrder()
+    dataLerp = BuildDataLerp(bpy.context.scene, obj, bm, records, dataLerp)
+    #new targets are usually still selected, let next tick redirect them
+    selectionSignature = None
+    cacheStale = True
+    loopOverlay.Tag()
+    return added
+
+def RemoveLockedLoop(obj, g):
+    """Unlocks loop of group g without touching other loops"""
+    global cacheStale
+    verts = groupVerts.pop(g) + groupRemainders.pop(g, [])
+    loopIndices.pop(g, None)
+    for v in verts:
+        loops = vertLoops.get(v)
+        if loops is None:
+            continue
+        loops.remove(g)
+        if len(loops) is 0:
+            del vertLoops[v]
+    
+    #records of one loop are always next to each other
+    records = loopRecords.pop(g, [])
+    first = 0
+    if lockSolver is not None:
+        first = lockSolver.FirstRecord(g)[0]
+        lockSolver.RemoveLoop(g)
+    elif len(records) > 0:
+        first = adjInfos.index(records[0])
+    stop = first +len(records)
+    columns = (recordTable.targets, recordTable.ends1, recordTable.ends2, recordTable.ratios)
+    for t, end1, end2, ratio in zip(*[c[first:stop] for c in columns]):
+        targets = targetRecords[t]
+        targets.remove((end1, end2, ratio))
+        if len(targets) is 0:
+            del targetRecords[t]
+    if len(records) > 0:
+        del adjInfos[first:stop]
+        recordTable.RemoveRange(first, len(records))
+    UpdateSolveOrder()
+    
+    removedGroup = g.index if isinstance(loopStorage, GroupLoopStorage) else None
+    loopStorage.RemoveLoop(bm, g, verts)
+    RemoveDataLerp(dataLerp, bm, first, len(records), removedGroup)
+    cacheStale = True
+    loopOverlay.Tag()
+    
+@Profiled("FindAutoLockLoops", lambda result, *args: len(result[0]))
+def FindAutoLockLoops(scene, bm):
+    """Lockable loops of the whole mesh that share no vertex with locked loops or each other
+    
+    Returns (loops, skipped), skipped ones overlap or would close a chain of locked loops.
+    """
+    tolerance, margin = scene.edgerAutoTolerance, scene.edgerAutoMargin
+    topology = GetMeshTopology(bm) if scene.isEdgerVectorized else None
+    if topology is not None:
+        verts = GetVertLookup(bm)
+        found = [[verts[i] for i in loop.tolist()] for loop in topology.LockableLoops(tolerance, margin)]
+    else: found = FindLockableLoops(bm.verts, tolerance, margin)
+    
+    #a vertex on two loops would get locked twice
+    taken = set(vertLoops)
+    loops = []
+    for loop in found:
+        if taken.isdisjoint(loop):
+            taken.update(loop)
+            loops.append(loop)
+    loops = OpenClosedChains(loops, groupVerts.values())[0]
+    return loops, len(found) -len(loops)
+
+#has to be global to sustain adjInfos between modal calls :'( sorry global haters )':
+isEditMode = False
+obj, me, bm = None, None, None
+groupVerts = {}     #dict[g] = [list, of, vertices]
+groupRemainders = {}    #dict[g] = [verts, not connected to the loop of g]
+adjInfos = []
+recordTable = None  #RecordTable of adjInfos, what the solver and deselecting resolve vertices through, validated before each pass
+lockSolver = None   #LockSolver built from adjInfos, None without numpy
+solveOrder = []     #adjInfos ordered so records reading other targets come after them
+solveCyclic = 0     #records at the end of solveOrder that lock each other in a cycle
+dataLerp = None     #DataLerp of layers interpolated with adjInfos, None if off
+vertLoops = {}      #dict[v] = [groups, v is in]
+loopRecords = {}    #dict[g] = [adjInfos, of, g]
+targetRecords = {}  #dict[target index] = [(end1, end2, ratioToEnd1) of records locking it], indices into recordTable.refs
+selectionSignature = None   #SelectionSignature seen after last DeselectGroups
+cacheStale = False  #loops changed since cache was saved, SaveStaleCache writes it
+loopIndices = {}    #dict[g] = (loop, remainder) vertex indices, what the cache gets written from
+loopStorage = None  #GroupLoopStorage or LayerLoopStorage of obj
+livePreview = None  #LivePreview of obj, None if off
+#noncyclics = []
+
+#the globals above belong to one mesh, the others in edit mode keep theirs in meshStates
+stateNames = ("isEditMode", "obj", "me", "bm", "groupVerts", "groupRemainders", "adjInfos", "recordTable",
+              "lockSolver", "solveOrder", "solveCyclic", "dataLerp", "vertLoops", "loopRecords", "targetRecords",
+              "selectionSignature", "cacheStale", "loopIndices", "loopStorage", "livePreview", "loopOverlay")
+meshStates = {}     #dict[mesh] = dict[name in stateNames] = value, for meshes whose state isn't in the globals
+
+def FreshState():
+    return {"isEditMode": False, "obj": None, "me": None, "bm": None, "groupVerts": {}, "groupRemainders": {},
+            "adjInfos": [], "recordTable": None, "lockSolver": None, "solveOrder": [], "solveCyclic": 0,
+            "dataLerp": None, "vertLoops": {}, "loopRecords": {}, "targetRecords": {}, "selectionSignature": None,
+            "cacheStale": False, "loopIndices": {}, "loopStorage": None, "livePreview": None, "loopOverlay": LoopOverlay()}
+
+def SwitchState(target):
+    """Puts the state kept for the mesh of target in the globals, the one there is kept in meshStates"""
+    if target is None or target.data == me:
+        return
+    names = globals()
+    if me is not None:
+        meshStates[me] = dict((name, names[name]) for name in stateNames)
+    state = meshStates.pop(target.data, None)
+    if state is None:
+        #owned right away so ReInit switching to it again keeps it
+        state = FreshState()
+        state["obj"], state["me"] = target, target.data
+    names.update(state)
+
+def DropStates(keep):
+    """Forgets states of meshes not in keep, their bmeshes are gone with edit mode"""
+    for key in [key for key in meshStates if key not in keep]:
+        SaveStaleCache(meshStates[key])
+        if isOverlayBatched:
+            meshStates[key]["loopOverlay"].Free()
+        del meshStates[key]
+    #the one in the globals stays until another mesh is edited
+    if me is not None and me not in keep:
+        SaveStaleCache(globals())
+    updatedMeshes.intersection_update(keep)
+
+def EditedObjects(context, active = None):
+    """Mesh objects in edit mode, one per mesh and the active one last so its state ends up in the globals
+    
+    Blender versions editing several objects at once list them in
+    objects_in_mode, older ones only edit the active object (context.object
+    unless given).
+    """
+    if active is None:
+        active = context.object
+    if active is not None and active.mode != "EDIT":
+        active = None
+    edited, meshes = [], set()
+    if active is not None:
+        meshes.add(active.data)
+    for o in getattr(context, "objects_in_mode", ()):
+        if o.type == 'MESH' and o.data not in meshes:
+            meshes.add(o.data)
+            edited.append(o)
+    if active is not None:
+        edited.append(active)
+    return edited
+
+bpy.types.Scene.isEdgerRunning = False
+bpy.types.Scene.deselectGroups = True
+bpy.types.Scene.isSelectFlush = bpy.props.BoolProperty(name="Flush", description="If vertex is not selected deselect parent face", default=False)
+bpy.types.Scene.isEdgerActive = True
+bpy.types.Scene.isEdgerDebugActive = bpy.props.BoolProperty(name="Draw", description="Toggle if edge loops should be drawn", default=True)
+bpy.types.Scene.edgerStorage = bpy.props.EnumProperty(name="Storage", description="Where locked loops are kept",
+    items=[('GROUPS', "Groups", "One _edger_ vertex group per loop"),
+           ('LAYER', "Layer", "Loop ids in one integer vertex layer, existing _edger_ groups get moved to it")],
+    default='GROUPS')
+bpy.types.Scene.edgerSchedule = bpy.props.EnumProperty(name="Schedule", description="When locking and deselecting run",
+    items=[('TIMER', "Timer", "Every 0.03 seconds"),
+           ('EVENTS', "Events", "On mesh updates and input, at most once per redraw, idle outside edit mode")],
+    default='TIMER')
+def ToggleProfiling(self, context):
+    profiler.enabled = self.isEdgerProfiling
+
+def ToggleDataLerp(self, context):
+    #records of another mesh or a freed bmesh get rebuilt by next ReInit
+    if recordTable is not None and bm is not None and bm.is_valid and obj == context.object:
+        UpdateDataLerp(self)
+
+bpy.types.Scene.isEdgerProfiling = bpy.props.BoolProperty(name="Profile", description="Time Edger stages and count what they handle, shown below and exportable as JSON", default=False, update=ToggleProfiling)
+bpy.types.Scene.edgerAutoTolerance = bpy.props.FloatProperty(name="Tolerance", description="Auto lock: how far off the line between its neighbours a vertex may be, relative to their distance", default=0.0001, min=0.0, max=0.5, precision=4)
+bpy.types.Scene.edgerAutoMargin = bpy.props.FloatProperty(name="Margin", description="Auto lock: skip loops with a vertex closer than this to either neighbour, relative to their distance", default=0.0, min=0.0, max=0.49, precision=3)
+bpy.types.Scene.edgerLerpData = bpy.props.EnumProperty(name="Interpolate", description="Layers of locked vertices interpolated between their ends like positions (needs numpy)",
+    items=[('UV', "UV", "All UV layers, faces split by a seam along the loop keep theirs"),
+           ('COLOR', "Color", "All vertex color layers"),
+           ('WEIGHT', "Weights", "Vertex group weights, _edger_ groups excluded")],
+    options={'ENUM_FLAG'}, default=set(), update=ToggleDataLerp)
+bpy.types.Scene.isEdgerVectorized = bpy.props.BoolProperty(name="Batch", description="Find loops and lock all vertices in batched array passes (needs numpy), otherwise one by one", default=True)
+
+#bpy.props.BoolProperty(name="Deselect", description="Deselect all verts from _edger_groups, and select edge end", default=True)
+#bpy.props.BoolProperty(name="Active", description="Toggle if Edger is active", default=False)
+
+class UnlockEdgeLoop(bpy.types.Operator):
+    """Unlock SINGLE selected edge loop"""
+    bl_idname = "wm.unlock_edge_loop_idname"
+    bl_label = "UnlockEdgeLoop_label"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'TOOLS'
+    
+    def execute(self, context):
+        EnsureInit(context)
+        
+        selected = []
+        for v in bm.verts:
+            if v.select is True:
+                selected.append(v)
+        
+        loops = LoopsOfVerts(selected)
+        if len(loops) > 0:
+            RemoveLockedLoop(obj, loops[0])
+        
+        return {'FINISHED'}
+
+class LockEdgeLoop(bpy.types.Operator):
+    """Lock selected edgeloop(s) as if it was on flat surface"""
+    bl_idname = "wm.lock_edge_loop_idname"
+    bl_label = "LockEdgeLoop_label"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'TOOLS'
+    
+    def execute(self, context):
+        EnsureInit(context)
+        
+        selected = []
+        for v in bm.verts:
+            if v.select is True:
+                selected.append(v)
+        AddLockedLoops(obj, bm, selected)
+        
+        return {'FINISHED'}
+
+class AutoLockEdgeLoops(bpy.types.Operator):
+    """Lock every cyclic edge loop whose vertices sit on the line between their neighbours"""
+    bl_idname = "wm.auto_lock_edge_loops_idname"
+    bl_label = "AutoLockEdgeLoops_label"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'TOOLS'
+    
+    def execute(self, context):
+        EnsureInit(context)
+        
+        loops, skipped = FindAutoLockLoops(context.scene, bm)
+        added = LockLoops(obj, bm, loops)
+        self.report({'INFO'}, "Edger: auto locked " +str(len(added)) +" loops, skipped " +str(skipped))
+        return {'FINISHED'}
+
+class UnselectableVertices(bpy.types.Operator):
+    """Make selected vertices unselectable"""
+    bl_idname = "wm.unselectable_vertices_idname"
+    bl_label = "unselectable_vertices_label"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'TOOLS'
+    
+    def execute(self, context):
+        global obj, me, bm
+        '''
+        name = "_unselectable_"
+        g = GetGroupByName(name)
+        if g is not None:
+            g = AddNewVertexGroup(name)
+        AddSelectedToGroup(bm, g)
+        '''
+        ReInit()
+        return {'FINISHED'}
+
+def DissolveLoops(bm, loops):
+    """Dissolves edges with both verts in the same loop (lists of vert indices) with one bmesh op, returns edge count"""
+    vertLoops = {}
+    for k, loop in enumerate(loops):
+        for i in loop:
+            vertLoops.setdefault(i, set()).add(k)
+    bm.verts.index_update()
+    edges = []
+    for e in bm.edges:
+        a, b = vertLoops.get(e.verts[0].index), vertLoops.get(e.verts[1].index)
+        if a is not None and b is not None and not a.isdisjoint(b):
+            edges.append(e)
+    if len(edges) > 0:
+        bmesh.ops.dissolve_edges(bm, edges=edges, use_verts=True)
+    return len(edges)
+
+def StoredLoops(obj, bm):
+    """Vertex lists of loops in _edger_ groups and the loop id layer of obj, read without changing obj"""
+    loops = []
+    deform_layer = bm.verts.layers.deform.active
+    if deform_layer is not None:
+        byIndex = dict((g.index, []) for g in obj.vertex_groups if g.name.startswith("_edger_"))
+        for v in bm.verts:
+            for i in v[deform_layer].keys():
+                if i in byIndex:
+                    byIndex[i].append(v)
+        loops += [byIndex[i] for i in sorted(byIndex) if len(byIndex[i]) > 0]
+    if LayerLoopStorage.registryName in obj:
+        loops += list(LayerLoopStorage(obj).GetLoops(bm).values())
+    return loops
+
+def HasEdgerLoops(obj):
+    return LayerLoopStorage.registryName in obj or any(g.name.startswith("_edger_") for g in obj.vertex_groups)
+
+def ClearObjectLoops(obj, batched = True):
+    """Dissolves edger loops of obj on its mesh data in place and strips their storage, returns (loops, edges)
+    
+    Needs no context, edit mode or operators so it runs in background mode.
+    Groups are refined like ReInit does before Clear Loops, only nothing
+    is written back since all of it gets stripped, the mesh ends up like
+    the copy Clear Loops makes.
+    """
+    bm = bmesh.new()
+    try:
+        bm.from_mesh(obj.data)
+        stored = dict(enumerate(StoredLoops(obj, bm)))
+        topology = GetMeshTopology(bm) if batched else None
+        if topology is not None:
+            refined = topology.FindAllCyclicLoops(stored, GetVertLookup(bm))
+        else: refined = FindAllCyclicLoops(stored)
+        bm.verts.index_update()
+        edges = DissolveLoops(bm, [[v.index for v in loop] for loop in refined])
+        if LayerLoopStorage.registryName in obj:
+            LayerLoopStorage(obj).StripMesh(bm)
+        bm.to_mesh(obj.data)
+    finally:
+        bm.free()
+    
+    #groups go after the mesh is written, removing one shifts deform indices of the rest
+    StripObjectLoops(obj)
+    obj.data.update()
+    return len(refined), edges
+
+def StripObjectLoops(obj, shared = False):
+    """Removes _edger_ groups, loop registry and cache from obj, its mesh is left as is
+    
+    shared is for linked duplicates of a mesh already stripped through another
+    object, removing their groups would shift its weights a second time.
+    """
+    me = obj.data
+    if shared:
+        obj.data = bpy.data.meshes.new("_edger_strip")
+    try:
+        GroupLoopStorage(obj).StripObject(obj)
+    finally:
+        if shared:
+            empty = obj.data
+            obj.data = me
+            bpy.data.meshes.remove(empty)
+    if LayerLoopStorage.registryName in obj:
+        LayerLoopStorage(obj).StripObject(obj)
+    for name in (cacheName, previewName):
+        if name in obj:
+            del obj[name]
+
+def CopyWithoutLoops(bm, storage):
+    """Copy of bm with edger loops dissolved and storage stripped, and the bm index of each of its verts"""
+    bm.verts.index_update()
+    copy = bm.copy()
+    #a copy keeps vertex order, loops of the edit mesh carry over by index
+    copy.verts.index_update()
+    layer = copy.verts.layers.int.new("_edger_source")
+    for v in copy.verts:
+        v[layer] = v.index
+    DissolveLoops(copy, [[v.index for v in groupVerts[g] +groupRemainders.get(g, [])] for g in groupVerts])
+    sources = [v[layer] for v in copy.verts]
+    copy.verts.layers.int.remove(layer)
+    storage.StripMesh(copy)
+    return copy, sources
+
+def DuplicateWithoutLoops(context, obj):
+    """Copy of obj with edger loops dissolved, made from the edit mesh so no mode switch is needed"""
+    editBm = bmesh.from_edit_mesh(obj.data)
+    storage = GetLoopStorage(context.scene, obj, editBm)
+    bm = CopyWithoutLoops(editBm, storage)[0]
+    
+    me = obj.data.copy()
+    bm.to_mesh(me)
+    bm.free()
+    
+    dup = obj.copy()
+    dup.data = me
+    storage.StripObject(dup)
+    for name in (cacheName, previewName):
+        if name in dup:
+            del dup[name]
+    context.scene.objects.link(dup)
+    return dup
+
+previewName = "_edger_preview"
+
+class LivePreview(object):
+    """Object showing source without its edger loops, kept in sync while editing
+    
+    The loop-free mesh is made like Clear Loops makes its copy, once, along
+    with the source vertex of every preview vertex. Passes after that only
+    copy coordinates that moved, in one foreach_set, and the mesh is made
+    again when TopologyFingerprint of the source changes.
+    """
+    gap = 0.25      #between source and preview, relative to the source width
+    
+    def __init__(self, source, preview = None):
+        self.source = source
+        self.object = preview
+        self.fingerprint = None
+        self.records = None     #recordTable and loops last checked, the fingerprint is only taken when they change
+        self.loops = None
+    
+    def Alive(self, context):
+        try:
+            return self.object is not None and self.object.name in context.scene.objects
+        except ReferenceError:
+            return False
+    
+    def Build(self, context, bm):
+        copy, self.sourceIndex = CopyWithoutLoops(bm, loopStorage)
+        if self.object is None:
+            name = self.source.name +"_preview"
+            self.object = bpy.data.objects.new(name, bpy.data.meshes.new(name))
+            #identity parent inverse, location is in the source's space
+            self.object.parent = self.source
+            self.object.hide_select = True
+            context.scene.objects.link(self.object)
+            self.source[previewName] = self.object.name
+        copy.to_mesh(self.object.data)
+        copy.free()
+        #beside the source along its x, not over it
+        xs = [v.co[0] for v in bm.verts]
+        width = max(xs) -min(xs) if len(xs) > 0 else 0.0
+        self.object.location = (width*(1.0 +self.gap), 0.0, 0.0)
+        self.fingerprint = MeshFingerprint(bm, groupVerts)
+        self.Remap(bm)
+    
+    def Remap(self, bm, co = None):
+        """Mirrors vertices of bm, co of the preview as it is saves writing all of it again"""
+        verts = GetVertLookup(bm)
+        self.mirror = CoordMirror([verts[i] for i in self.sourceIndex])
+        self.mirror.co = co
+        self.records, self.loops = recordTable, set(groupVerts)
+    
+    @Profiled("LivePreview.Update", lambda moved, *args: moved)
+    def Update(self, context, bm, touched = True):
+        """Follows the edit mesh of source, returns preview vertices written
+        
+        Coordinates are only read when touched or records changed, the
+        whole mesh is only made again when its topology did.
+        """
+        #ReInit after undo keeps the topology but hands out new verts
+        if recordTable is not self.records or set(groupVerts) != self.loops:
+            if MeshFingerprint(bm, groupVerts) != self.fingerprint:
+                self.Build(context, bm)
+            else: self.Remap(bm, self.mirror.co)
+        elif not touched:
+            return 0
+        moved = self.mirror.Update()
+        if moved > 0:
+            self.object.data.vertices.foreach_set("co", self.mirror.co.ravel())
+            self.object.data.update()
+        return moved
+    
+    def Remove(self, context):
+        if previewName in self.source:
+            del self.source[previewName]
+        if self.Alive(context):
+            me = self.object.data
+            context.scene.objects.unlink(self.object)
+            bpy.data.objects.remove(self.object)
+            bpy.data.meshes.remove(me)
+        self.object = None
+
+def AttachedPreview(context, source):
+    """LivePreview of the preview object source had when it left edit mode, None if it has none"""
+    name = source.get(previewName)
+    if np is None or name is None or name not in context.scene.objects:
+        return None
+    return LivePreview(source, bpy.data.objects[name])
+    
+class ClearEdgerLoops(bpy.types.Operator):
+    """Create duplicate of object and remove _edger_ vertexGroups and delete their Edge Loops"""
+    bl_idname = "wm.clear_edger_oops_idname"
+    bl_label = "clear_edger_oops__label"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'TOOLS'
+    
+    def execute(self, context):
+        #refined groups are the loops to delete, records still valid were refined already
+        EnsureInit(context)
+        source = context.object
+        dup = DuplicateWithoutLoops(context, source)
+        
+        #like duplicating, editing goes on in the copy
+        bpy.ops.object.mode_set(mode = 'OBJECT')
+        source.select = False
+        dup.select = True
+        context.scene.objects.active = dup
+        bpy.ops.object.mode_set(mode = 'EDIT')
+        bpy.types.Scene.isEdgerActive = False
+        return {'FINISHED'}
+
+class ToggleEdgerPreview(bpy.types.Operator):
+    """Show the active object without its edger loops, following edits live (needs numpy)"""
+    bl_idname = "wm.toggle_edger_preview"
+    bl_label = "Toggle Edger Preview"
+    
+    def execute(self, context):
+        global livePreview
+        EnsureInit(context)
+        if livePreview is not None:
+            livePreview.Remove(context)
+            livePreview = None
+        else:
+            livePreview = LivePreview(context.object)
+            livePreview.Update(context, bm)
+        return {'FINISHED'}
+    
+'''
+class EdgerFunc1(bpy.types.Operator):
+    """EdgerFunc1"""
+    bl_idname = "wm.edger_func1_idname"
+    bl_label = "EdgerFunc1_label"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'TOOLS'
+    
+    def execute(self, context):
+      
+        return {'FINISHED'}
+'''
+
+def RunEdger():
+    try: bpy.utils.register_class(Edger)
+    except: pass
+    bpy.ops.wm.edger()
+    bpy.types.Scene.isEdgerRunning = True
+   
+def StopEdger():
+    try: bpy.types.SpaceView3D.draw_handler_remove(_handle, 'WINDOW')
+    except: pass
+    try: bpy.utils.unregister_class(Edger)
+    except: pass
+    bpy.types.Scene.isEdgerRunning = False
+    
+class ToggleEdger(bpy.types.Operator):
+    """Start or stop running Edger modal operator"""
+    bl_idname = "uv.toggle_edger"
+    bl_label = "Toggle Edger"
+
+    def execute(self, context):
+        if bpy.types.Scene.isEdgerRunning:
+            StopEdger()
+        else: RunEdger()
+        
+        return {'FINISHED'}
+    
+class ToggleLocking(bpy.types.Operator):
+    """Toggle Locking of vertices on a line"""
+    bl_idname = "uv.toggle_edger_locking"
+    bl_label = "Toggle Edger Locking"
+
+    def execute(self, context):
+        bpy.types.Scene.isEdgerActive = not bpy.types.Scene.isEdgerActive
+        return {'FINISHED'}
+    
+class ToggleDeselecting(bpy.types.Operator):
+    """Toggle Deselecting of locked vertices"""
+    bl_idname = "uv.toggle_edger_deselecting"
+    bl_label = "Toggle Edger Deselecting"
+
+    def execute(self, context):
+        bpy.types.Scene.deselectGroups = not bpy.types.Scene.deselectGroups
+        return {'FINISHED'}
+
+bpy.props.StringProperty()
+class Edger(bpy.types.Operator):
+    """Lock vertices on edge"""
+    bl_idname = "wm.edger"
+    bl_label = "Edger"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'TOOLS'
+    
+    _timer = None
+    _schedule = None
+    
+    def modal(self, context, event):
+        if bpy.types.Scene.isEdgerRunning is False:
+            return self.cancel(context)
+        if context.scene.edgerSchedule != self._schedule:
+            self.SetSchedule(context, context.scene.edgerSchedule)
+        
+        if event.type == 'TIMER':
+            if self._schedule == 'TIMER':
+                TimedPass(context)
+        #clicks and keys may change selection without a data update, mouse moves alone can't
+        elif event.type not in ('MOUSEMOVE', 'INBETWEEN_MOUSEMOVE'):
+            edgerSchedule.pending = True
+
+        return {'PASS_THROUGH'}
+
+    def SetSchedule(self, context, schedule):
+        if self._timer is not None:
+            context.window_manager.event_timer_remove(self._timer)
+            self._timer = None
+        for handler in (EdgerDataUpdate, EdgerSceneUpdate):
+            if handler in bpy.app.handlers.scene_update_post:
+                bpy.app.handlers.scene_update_post.remove(handler)
+        if EdgerSavePre in bpy.app.handlers.save_pre:
+            bpy.app.handlers.save_pre.remove(EdgerSavePre)
+        updatedMeshes.clear()
+        
+        #either schedule needs to hear of data updates, before EdgerSceneUpdate runs a pass on them
+        if schedule is not None:
+            bpy.app.handlers.scene_update_post.append(EdgerDataUpdate)
+            bpy.app.handlers.save_pre.append(EdgerSavePre)
+        if schedule == 'TIMER':
+            self._timer = context.window_manager.event_timer_add(0.03, context.window)
+        elif schedule == 'EVENTS':
+            bpy.app.handlers.scene_update_post.append(EdgerSceneUpdate)
+            edgerSchedule.pending = True
+        self._schedule = schedule
+
+    def execute(self, context):
+        self.SetSchedule(context, context.scene.edgerSchedule)
+        
+        args = (self, context)
+        if isOverlayBatched:
+            self._handle = bpy.types.SpaceView3D.draw_handler_add(draw_callback_view, args, 'WINDOW', 'POST_VIEW')
+        else: self._handle = bpy.types.SpaceView3D.draw_handler_add(draw_callback_px, args, 'WINDOW', 'POST_PIXEL')
+
+        context.window_manager.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def cancel(self, context):
+        self.SetSchedule(context, None)
+        StopTrace()
+        bpy.types.SpaceView3D.draw_handler_remove(self._handle, 'WINDOW')
+        if isOverlayBatched:
+            loopOverlay.Free()
+        DropStates(())
+
+        return {'CANCELLED'}
+        
+@Profiled("EdgerPass")
+def EdgerPass(context):
+    """One rebuild check, deselect and lock pass over every mesh in edit mode
+    
+    Each mesh keeps its records between passes, switching between them
+    doesn't rebuild any that are still valid.
+    """
+    global isEditMode
+    edited = EditedObjects(context)
+    DropStates(set(o.data for o in edited))
+    if len(edited) is 0:
+        isEditMode = False
+        return
+    for target in edited:
+        SwitchState(target)
+        touched = MeshPass(context, target)
+        if livePreview is not None:
+            PreviewPass(context, touched)
+
+def MeshPass(context, target):
+    """EdgerPass of one object, its state has to be in the globals
+    
+    Returns False when its mesh data is known to be as it was last pass.
+    """
+    global isEditMode
+    obj = target
+    me = obj.data
+    bm = bmesh.from_edit_mesh(me)
+    
+    #moved by the user or us, the overlay has to follow even with locking off
+    touched = me in updatedMeshes
+    if touched:
+        updatedMeshes.discard(me)
+        loopOverlay.Tag()
+    
+    #at most one rebuild per tick, on entering edit mode or when records went stale
+    rebuilt = False
+    #vertices are only compared after mesh updates, idle passes check the count
+    if isEditMode is False or not RecordsAreValid(obj, bm, touched):
+        isEditMode = True
+        ReInit(context, obj)
+        rebuilt = touched = True
+    
+    if context.scene.isEdgerActive is False:
+        return touched
+    
+    changed = False
+    try:
+        if context.scene.deselectGroups:
+            changed = DeselectGroups(me, bm)
+        #only redirecting leaves faces of deselected targets selected
+        if changed and context.scene.isSelectFlush is False:
+            bm.select_flush(False)
+        if LockAllVerts(context, adjInfos) > 0:
+            changed = True
+    #face corners data lerp reads aren't in the table, faces rebuilt over the same vertices free them
+    except ReferenceError:
+        if not rebuilt:
+            ReInit(context, obj)
+        return True
+    
+    #idle ticks, nothing moved or got deselected so skip mesh update
+    if changed:
+        me.update()
+        loopOverlay.Tag()
+    return touched or changed
+
+def PreviewPass(context, touched = True):
+    """Brings livePreview of the mesh in the globals up to date, after its locking moved what it does
+    
+    touched is what MeshPass returned, untouched meshes are only checked for new records.
+    """
+    global livePreview
+    if not livePreview.Alive(context):
+        livePreview = None
+        return
+    try:
+        livePreview.Update(context, bm, touched)
+    #freed vertex, mapped again next pass
+    except ReferenceError:
+        livePreview.records = None
+
+class EdgerSchedule(object):
+    """When EVENTS schedule runs passes and how long they take in either schedule"""
+    def __init__(self):
+        self.pending = False    #mesh update or input seen since last pass
+        self.redrawn = True     #view drew since last pass, passes coalesce to one per redraw
+        self.passes = 0
+        self.lastTime = 0.0     #seconds of the last pass
+        self.maxTime = 0.0
+
+edgerSchedule = EdgerSchedule()
+
+def TimedPass(context):
+    if traceRecorder is not None:
+        traceRecorder.Before(context)
+    start = time.perf_counter()
+    EdgerPass(context)
+    edgerSchedule.lastTime = time.perf_counter() -start
+    if traceRecorder is not None:
+        traceRecorder.After(context, edgerSchedule.lastTime)
+    edgerSchedule.maxTime = max(edgerSchedule.maxTime, edgerSchedule.lastTime)
+    edgerSchedule.passes += 1
+    edgerSchedule.pending = False
+    edgerSchedule.redrawn = False
+
+updatedMeshes = set()  #meshes in edit mode whose data changed since their last pass
+
+def EdgerDataUpdate(scene):
+    """scene_update_post handler of every schedule, notes edited meshes with updated data"""
+    if bpy.types.Scene.isEdgerRunning is False:
+        return
+    for o in EditedObjects(bpy.context, scene.objects.active):
+        if o.is_updated_data:
+            updatedMeshes.add(o.data)
+
+def EdgerSceneUpdate(scene):
+    """scene_update_post handler of EVENTS schedule, dormant outside edit mode"""
+    global isEditMode
+    if bpy.types.Scene.isEdgerRunning is False:
+        return
+    edited = EditedObjects(bpy.context, scene.objects.active)
+    if len(edited) is 0:
+        if isEditMode:
+            DropStates(())
+        isEditMode = False
+        return
+    #transforms, undo and our own me.update() all tag the data
+    if any(o.is_updated_data for o in edited) or isEditMode is False:
+        edgerSchedule.pending = True
+    if edgerSchedule.pending and edgerSchedule.redrawn:
+        TimedPass(bpy.context)
+
+def EdgerSavePre(dummy):
+    """save_pre handler, loops locked or unlocked since get their topology cache into the file"""
+    for state in list(meshStates.values()) +[globals()]:
+        SaveStaleCache(state)
+
+class TraceRecorder(object):
+    """Writes what every pass got as input to a trace, edger_replay.py plays it back without Blender
+    
+    The whole edit mesh is read before and after each pass to see what the
+    user moved and (de)selected in between, that only happens while recording.
+    The trace starts with the mesh as the first pass in edit mode left it.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.writer = None
+    
+    def EditMesh(self, context):
+        if context.object is None or context.object.mode != "EDIT":
+            return None
+        return bmesh.from_edit_mesh(context.object.data)
+    
+    def Snapshot(self, bm):
+        self.co = GetVertsCo(bm.verts).astype(np.float32)
+        self.selected = np.array([v.select for v in bm.verts], dtype=bool)
+        self.records = recordTable
+        self.loops = set(groupVerts)
+    
+    def Loops(self):
+        return [[v.index for v in groupVerts[g] +groupRemainders.get(g, [])] for g in groupVerts]
+    
+    def Before(self, context):
+        self.input = None
+        bm = self.EditMesh(context)
+        if self.writer is None or bm is None:
+            return
+        bm.verts.index_update()
+        co = GetVertsCo(bm.verts).astype(np.float32)
+        selected = np.array([v.select for v in bm.verts], dtype=bool)
+        if len(co) != len(self.co):
+            self.input = (TRACE_TOPOLOGY, len(co), [], [], [])
+            return
+        moved = (co != self.co).any(axis=1).nonzero()[0]
+        self.input = (0, len(co), moved, co[moved], (selected != self.selected).nonzero()[0])
+    
+    def After(self, context, seconds):
+        bm = self.EditMesh(context)
+        if bm is None or recordTable is None:
+            return
+        bm.verts.index_update()
+        if self.writer is None:
+            self.writer = TraceWriter(self.path, GetVertsCo(bm.verts), [[v.index for v in f.verts] for f in bm.faces],
+                                      self.Loops(), [v.index for v in bm.verts if v.select])
+        elif self.input is not None:
+            flags, vertCount, moved, co, toggled = self.input
+            if recordTable is not self.records:
+                flags |= TRACE_REINIT
+            loops = None
+            if set(groupVerts) != self.loops or flags & TRACE_REINIT:
+                flags |= TRACE_LOOPS
+                loops = self.Loops()
+            self.writer.Tick(flags, seconds, vertCount, moved, co, toggled, loops)
+        self.Snapshot(bm)
+    
+    def Close(self):
+        if self.writer is not None:
+            self.writer.Close()
+            print("Edger: recorded " +str(self.writer.ticks) +" ticks to " +self.path)
+
+traceRecorder = None    #TraceRecorder while a trace is recorded
+
+def StopTrace():
+    global traceRecorder
+    if traceRecorder is not None:
+        traceRecorder.Close()
+        traceRecorder = None
+
+class RecordEdgerTrace(bpy.types.Operator, ExportHelper):
+    """Record what every pass gets as input, to replay and time it outside Blender with edger_replay.py"""
+    bl_idname = "wm.record_edger_trace"
+    bl_label = "Record Edger Trace"
+    
+    filename_ext = ".edgertrace"
+    
+    @classmethod
+    def poll(cls, context):
+        return np is not None
+    
+    def execute(self, context):
+        global traceRecorder
+        StopTrace()
+        traceRecorder = TraceRecorder(self.filepath)
+        edgerSchedule.pending = True
+        return {'FINISHED'}
+
+class StopEdgerTrace(bpy.types.Operator):
+    """Stop recording and close the trace"""
+    bl_idname = "wm.stop_edger_trace"
+    bl_label = "Stop Edger Trace"
+    
+    def execute(self, context):
+        StopTrace()
+        return {'FINISHED'}
+
+class ExportEdgerProfile(bpy.types.Operator, ExportHelper):
+    """Save per stage timings and counters as JSON"""
+    bl_idname = "wm.export_edger_profile"
+    bl_label = "Export Edger Profile"
+    
+    filename_ext = ".json"
+    
+    def execute(self, context):
+        with open(self.filepath, "w") as f:
+            f.write(profiler.ToJSON())
+        return {'FINISHED'}
+
+class ResetEdgerProfile(bpy.types.Operator):
+    """Forget recorded timings and counters"""
+    bl_idname = "wm.reset_edger_profile"
+    bl_label = "Reset Edger Profile"
+    
+    def execute(self, context):
+        profiler.Reset()
+        return {'FINISHED'}
+
+#addon_keymaps = []
+#def menu_func_edger(self, context): self.layout.operator(Edger.bl_idname)
+
+class EdgerPanel(bpy.types.Panel):
+    """Edger Panel"""
+    bl_label = "Edger"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'TOOLS'   #TODO
+    def draw(self, context):
+        layout = self.layout
+        row = layout.row()          
+ 
+        if(bpy.types.Scene.isEdgerRunning):
+            #row.prop(context.scene, 'isEdgerActive')
+            
+            ic = "UNLOCKED"
+            if bpy.types.Scene.isEdgerActive:
+                ic = "LOCKED"
+            row.operator(ToggleLocking.bl_idname, text="Lock", icon=ic)
+            
+            ic = "RESTRICT_SELECT_OFF"
+            if bpy.types.Scene.deselectGroups:
+                ic = "RESTRICT_SELECT_ON"
+            row.operator(ToggleDeselecting.bl_idname, text="Deselect", icon=ic)
+            
+            row = layout.row()
+            row.prop(context.scene, 'isEdgerDebugActive')
+            row.prop(context.scene, 'isSelectFlush')
+            if np is not None:
+                row.prop(context.scene, 'isEdgerVectorized')
+            if np is not None:
+                row = layout.row()
+                row.prop(context.scene, 'edgerLerpData', expand=True)
+            row = layout.row()
+            row.prop(context.scene, 'edgerStorage', expand=True)
+            row = layout.row()
+            row.prop(context.scene, 'edgerSchedule', expand=True)
+            if context.scene.isEdgerDebugActive:
+                row = layout.row()
+                row.label(text="Overlay: %d verts, %d calls, %d of %d loops" % (loopOverlay.vertCount, loopOverlay.drawCalls, loopOverlay.loopsDrawn, len(groupVerts)))
+                row = layout.row()
+                row.label(text="Pass: %.2f ms, max %.2f ms, %d runs, %d records in cycles" % (edgerSchedule.lastTime*1000, edgerSchedule.maxTime*1000, edgerSchedule.passes, solveCyclic))
+            
+            row = layout.row()
+            row.prop(context.scene, 'isEdgerProfiling')
+            if context.scene.isEdgerProfiling:
+                row.operator(ResetEdgerProfile.bl_idname, text="Reset")
+                row.operator(ExportEdgerProfile.bl_idname, text="Export")
+                col = layout.column(align=True)
+                for stage, stats in profiler.Report().items():
+                    col.label(text="%s: %d x, %.2f ms mean, p95 %.2f, max %.2f, %d items" % (stage, stats["calls"], stats["mean"], stats["p95"], stats["max"], stats["items"]))
+            if np is not None:
+                row = layout.row()
+                if traceRecorder is None:
+                    row.operator(RecordEdgerTrace.bl_idname, text="Record Trace")
+                else:
+                    row.operator(StopEdgerTrace.bl_idname, text="Stop Trace", icon="REC")
+                    row.label(text="%d ticks" % (traceRecorder.writer.ticks if traceRecorder.writer is not None else 0))
+        
+            #row = layout.row()
+            #row.label(text="")
+            split = layout.split()
+            col = split.column(align=True)
+            #col.operator(UnselectableVertices.bl_idname, text="Unselectable", icon = "RESTRICT_SELECT_ON")
+            #row.label(text="Edgeloops")
+            row = layout.row()
+            sub = row.row(align=True)
+            sub.operator(LockEdgeLoop.bl_idname, text="Add", icon = "ZOOMIN")
+            sub.operator(UnlockEdgeLoop.bl_idname, text="Remove", icon = "ZOOMOUT")
+            
+            row = layout.row()
+            row.operator(AutoLockEdgeLoops.bl_idname, text="Auto Lock")
+            sub = row.row(align=True)
+            sub.prop(context.scene, 'edgerAutoTolerance', text="")
+            sub.prop(context.scene, 'edgerAutoMargin', text="")
+            
+            row = layout.row()
+            row.operator(ClearEdgerLoops.bl_idname, text="Clear Loops", icon = "MOD_SOLIDIFY")
+            if np is not None:
+                row.operator(ToggleEdgerPreview.bl_idname, text="Preview", icon = "RESTRICT_VIEW_OFF" if livePreview is not None else "RESTRICT_VIEW_ON")
+            row = layout.row()
+            row.label(text="")
+            row.operator(ToggleEdger.bl_idname, text="stop", icon = "X_VEC")
+        else:
+            row = layout.row();row.label(text="")
+            row = layout.row();row.label(text="")
+            row = layout.row();row.label(text="")
+            row = layout.row();row.label(text="")
+            row = layout.row()
+            row.operator(ToggleEdger.bl_idname, text="Run", icon = "POSE_HLT")    
+            row.label(text="")            
+          
+        
+            
+        
+#handle the keymap
+#wm = bpy.context.window_manager
+#km = wm.keyconfigs.addon.keymaps.new(name='UV Editor', space_type='EMPTY')
+#kmi = km.keymap_items.new(UvSquaresByShape.bl_idname, 'E', 'PRESS', alt=True)
+#addon_keymaps.append((km, kmi))
+
+def register():
+    bpy.utils.register_class(Edger)
+    bpy.utils.register_class(ToggleEdger)
+    #bpy.utils.register_class(EdgerFunc1)
+    bpy.utils.register_class(LockEdgeLoop)
+    bpy.utils.register_class(AutoLockEdgeLoops)
+    bpy.utils.register_class(ToggleDeselecting)
+    bpy.utils.register_class(ToggleLocking)
+    bpy.utils.register_class(UnlockEdgeLoop)
+    bpy.utils.register_class(ClearEdgerLoops)
+    bpy.utils.register_class(ToggleEdgerPreview)
+    bpy.utils.register_class(UnselectableVertices)
+    bpy.utils.register_class(ExportEdgerProfile)
+    bpy.utils.register_class(ResetEdgerProfile)
+    bpy.utils.register_class(RecordEdgerTrace)
+    bpy.utils.register_class(StopEdgerTrace)
+    bpy.utils.register_class(EdgerPanel)
+
+def unregister():
+    try: bpy.utils.unregister_class(Edger)
+    except RuntimeError: pass
+    for handler in (EdgerDataUpdate, EdgerSceneUpdate):
+        if handler in bpy.app.handlers.scene_update_post:
+            bpy.app.handlers.scene_update_post.remove(handler)
+    if EdgerSavePre in bpy.app.handlers.save_pre:
+        bpy.app.handlers.save_pre.remove(EdgerSavePre)
+    StopTrace()
+    bpy.utils.unregister_class(ToggleEdger)
+    #bpy.utils.unregister_class(EdgerFunc1)
+    bpy.utils.unregister_class(LockEdgeLoop)
+    bpy.utils.unregister_class(AutoLockEdgeLoops)
+    bpy.utils.unregister_class(ToggleDeselecting)
+    bpy.utils.unregister_class(ToggleLocking)
+    bpy.utils.unregister_class(UnlockEdgeLoop)
+    bpy.utils.unregister_class(ClearEdgerLoops)
+    bpy.utils.unregister_class(ToggleEdgerPreview)
+    bpy.utils.unregister_class(UnselectableVertices)
+    bpy.utils.unregister_class(ExportEdgerProfile)
+    bpy.utils.unregister_class(ResetEdgerProfile)
+    bpy.utils.unregister_class(RecordEdgerTrace)
+    bpy.utils.unregister_class(StopEdgerTrace)
+    bpy.utils.unregister_class(EdgerPanel)
+
+if __name__ == "__main__":
+    register()
@@ -0,0 +1,1642 @@
+"""Edger graph and locking logic, free of bpy so it runs outside Blender
+
+Everything here works on any mesh that looks like bmesh for the parts
+Edger touches:
+
+    vert:  co, index, select, link_edges, link_loops
+    edge:  verts, is_manifold, other_vert(v)
+    loop:  vert, edge, face, link_loop_next, link_loop_prev, link_loop_radial_next
+    face:  verts, loops
+    mesh:  verts, edges, faces (verts also index_update())
+
+BMesh already is that, the addon in __init__.py passes bmesh straight in
+and keeps loop storage in vertex groups. MemMesh is a plain Python
+implementation used by edger_bench.py to time the same code on synthetic
+meshes and by edger_replay.py to play back recorded edit sessions, they
+import this module on its own since the package needs bpy.
+"""
+import math
+import array
+import operator
+import time
+import json
+import struct
+import zlib
+import itertools
+import collections
+try: import numpy as np
+except ImportError: np = None
+
+class StageStats(object):
+    __slots__ = ("calls", "total", "max", "items", "recent")
+    def __init__(self, window):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.items = 0
+        self.recent = collections.deque(maxlen = window)    #last durations, for percentiles
+
+class Profiler(object):
+    """Call counts, durations and item counts per stage, records nothing until enabled"""
+    def __init__(self, window = 256):
+        self.enabled = False
+        self.window = window
+        self.stages = collections.OrderedDict()
+    
+    def Add(self, stage, duration, items = 0):
+        stats = self.stages.get(stage)
+        if stats is None:
+            stats = self.stages[stage] = StageStats(self.window)
+        stats.calls += 1
+        stats.total += duration
+        stats.max = max(stats.max, duration)
+        stats.items += items
+        stats.recent.append(duration)
+    
+    def Reset(self):
+        self.stages.clear()
+    
+    def Report(self):
+        """dict[stage] of counters, durations in milliseconds"""
+        report = collections.OrderedDict()
+        for stage, stats in self.stages.items():
+            recent = sorted(stats.recent)
+            report[stage] = {
+                "calls": stats.calls,
+                "items": stats.items,
+                "total": stats.total*1000,
+                "mean": stats.total*1000/stats.calls,
+                "max": stats.max*1000,
+                "p50": Percentile(recent, 0.5)*1000,
+                "p95": Percentile(recent, 0.95)*1000}
+        return report
+    
+    def ToJSON(self):
+        return json.dumps(self.Report(), indent=2)
+
+def Percentile(ordered, p):
+    if len(ordered) is 0:
+        return 0.0
+    return ordered[min(len(ordered) -1, int(p*len(ordered)))]
+
+profiler = Profiler()
+
+def Profiled(stage, items = None):
+    """Times calls into profiler while it is enabled, items(result, *args) counts what a call handled"""
+    def Wrap(f):
+        def Timed(*args, **kwargs):
+            if profiler.enabled is False:
+                return f(*args, **kwargs)
+            start = time.perf_counter()
+            result = f(*args, **kwargs)
+            profiler.Add(stage, time.perf_counter() -start, items(result, *args) if items else 0)
+            return result
+        Timed.__name__, Timed.__doc__ = f.__name__, f.__doc__
+        return Timed
+    return Wrap
+
+def walk_edgeloop(l):
+    for l in walk_edgeloop_loops(l):
+        yield l.edge
+
+def walk_edgeloop_loops(l):
+    """Like walk_edgeloop but yields the loop each edge was reached through"""
+    e_first = l.edge
+    while True:
+        yield l
+        
+        if l.edge.is_manifold is False:
+            print("not manifold")
+            break
+        
+        l = NextInEdgeloop(l)
+        if l is None or l.edge is e_first:
+            break
+
+def NextInEdgeloop(l):
+    """Loop of the next edge in edge loop direction, None where the walk stops"""
+    if l.edge.is_manifold is False:
+        return None
+    
+    l = l.link_loop_next
+    
+    l = l.link_loop_radial_next
+    if len(l.face.verts) is not 4:
+        return None
+    
+    return l.link_loop_next
+
+def FindCyclicLoops(verts):
+    """Vertex sets of all cyclic edge loops that lay fully in verts
+    
+    A walk only depends on the loop it starts from, so loops already seen
+    on a rejected walk or on an accepted closed ring are not walked again.
+    A chain coming back over its own edges (mobius strip) stops early at the
+    other loop of the start edge and a ring over flipped faces can be accepted
+    from some of its loops only, those walks are not pruned.
+    """
+    gr = set(verts)
+    cyclics = set()
+    known = set()
+    for v in verts:
+        for l in v.link_loops:
+            if l in known:
+                continue
+            
+            walked = []
+            validEdges = []
+            for wl in walk_edgeloop_loops(l):
+                walked.append(wl)
+                e = wl.edge
+                ve1, ve2 = e.verts[0], e.verts[1]
+                
+                if ve1 not in gr or ve2 not in gr or \
+                   len(ve1.link_edges) is 3 or \
+                   len(ve2.link_edges) is 3:
+                    validEdges = []
+                    break
+                validEdges.append(e)
+            
+            if len(validEdges) is 0:
+                #every start up to the breaking edge runs into it too
+                if len(set(wl.edge for wl in walked)) == len(walked):
+                    known.update(walked)
+                continue
+
+            if len(validEdges) >2:
+                e1 = validEdges[0]
+                e2 = validEdges[len(validEdges)-1]
+                
+                #if loop is cyclic
+                if e1.verts[0] in e2.verts or \
+                   e1.verts[1] in e2.verts:
+                    forSet = set()
+                    for e in validEdges:
+                        forSet.update(e.verts)
+                    
+                    cyclics.add(frozenset(forSet))
+
+                    #accepted ring closed on itself, same edges from any of its loops
+                    if NextInEdgeloop(walked[-1]) == l:
+                        known.update(walked)
+    return cyclics
+        
+def FindAllCyclicLoops(groupVerts):
+    """Vertex sets of cyclic loops found in any of the groups"""
+    allLoops = set()
+    for g in groupVerts:
+        allLoops.update(FindCyclicLoops(groupVerts[g]))
+    return allLoops
+
+def SortedUnique(a):
+    """np.unique of an index array, sorting beats the hashing newer numpy does for them"""
+    a = np.sort(a)
+    return a[np.concatenate(([True], a[1:] != a[:-1]))] if len(a) > 0 else a
+
+def UniqueCounts(a):
+    """Sorted unique values of an index array, position of the first of each in a and their counts
+    
+    np.unique with return_counts needs numpy 1.9, Blender 2.7x bundles older ones.
+    """
+    order = np.argsort(a, kind="mergesort")
+    ordered = a[order]
+    firsts = np.concatenate(([True], ordered[1:] != ordered[:-1])).nonzero()[0] if len(a) > 0 else order
+    return ordered[firsts], order[firsts], np.diff(np.append(firsts, len(a)))
+
+def IsIn(a, values):
+    """Mask of a where it is one of values, np.isin needs numpy 1.13 and np.in1d is gone in 2.x"""
+    values = SortedUnique(values)
+    if len(values) is 0:
+        return np.zeros(len(a), dtype=bool)
+    found = np.minimum(np.searchsorted(values, a), len(values) -1)
+    return values[found] == a
+
+class MeshTopology(object):
+    """Edge, loop and face connectivity of a whole mesh as flat index arrays
+    
+    Loops of a face are consecutive from its start like in Mesh.loops, so
+    NextInEdgeloop of every loop is computed up front as loopSucc and
+    rings get walked on integers instead of mesh elements. Needs numpy.
+    """
+    def __init__(self, vertCount, edgeVerts, loopVerts, loopEdges, faceStarts, faceSizes, co = None):
+        self.vertCount = vertCount
+        self.co = None if co is None else np.asarray(co, dtype=np.float64).reshape(-1, 3)
+        self.edgeVerts = np.asarray(edgeVerts, dtype=np.intp).reshape(-1, 2)
+        self.loopVerts = np.asarray(loopVerts, dtype=np.intp)
+        self.loopEdges = np.asarray(loopEdges, dtype=np.intp)
+        faceStarts = np.asarray(faceStarts, dtype=np.intp)
+        faceSizes = np.asarray(faceSizes, dtype=np.intp)
+        self.valence = np.bincount(self.edgeVerts.ravel(), minlength=vertCount)
+        
+        loopCount = len(self.loopEdges)
+        loopFaces = np.repeat(np.arange(len(faceSizes)), faceSizes)
+        starts, sizes = faceStarts[loopFaces], faceSizes[loopFaces]
+        loopNext = starts +(np.arange(loopCount) -starts +1) %sizes
+        
+        #radial_next is the other loop of a manifold edge and the loop itself on a boundary
+        edgeLoops = np.bincount(self.loopEdges, minlength=len(self.edgeVerts))
+        #radial order of 3+ faces on an edge is not in the arrays, walk those with bmesh
+        self.isSupported = not (edgeLoops > 2).any()
+        radial = np.arange(loopCount)
+        byEdge = np.argsort(self.loopEdges, kind="mergesort")
+        firsts = (np.cumsum(edgeLoops) -edgeLoops)[edgeLoops == 2]
+        a, b = byEdge[firsts], byEdge[firsts +1]
+        radial[a], radial[b] = b, a
+        
+        # same steps as NextInEdgeloop
+        r = radial[loopNext]
+        walkable = (edgeLoops[self.loopEdges] == 2) & (sizes[r] == 4)
+        self.loopSucc = np.where(walkable, loopNext[r], -1)
+    
+    def LoopsOfVerts(self, indices):
+        """Loops of every vertex in indices, what v.link_loops gives one by one"""
+        if not hasattr(self, "loopsByVert"):
+            self.loopsByVert = np.argsort(self.loopVerts, kind="mergesort")
+            self.vertLoopCount = np.bincount(self.loopVerts, minlength=self.vertCount)
+            self.vertLoopStart = np.cumsum(self.vertLoopCount) -self.vertLoopCount
+        counts = self.vertLoopCount[indices]
+        offsets = np.repeat(np.cumsum(counts) -counts, counts)
+        return self.loopsByVert[np.repeat(self.vertLoopStart[indices], counts) +np.arange(counts.sum()) -offsets]
+    
+    def FindCyclicLoops(self, groups):
+        """Vertex index sets of cyclic loops fully in one of groups (lists of indices), same as FindCyclicLoops"""
+        return set(frozenset(loop.tolist()) for loop in self.CyclicLoopArrays(groups))
+    
+    def CyclicLoopArrays(self, groups, edgeMask = None):
+        """Sorted vertex index arrays of what FindCyclicLoops finds, walks only use edges in edgeMask if given
+        
+        Works on (group, loop) nodes where the next node of a walk is an
+        array lookup, -1 where the walk ends and -2 where it leaves the
+        group. Pointer doubling then gives every node its ring or the end
+        of its path in log2(longest walk) array passes, so walks from every
+        start are known without stepping through them.
+        """
+        n, loopCount = self.vertCount, len(self.loopEdges)
+        groups = [np.asarray(indices, dtype=np.intp) for indices in groups]
+        if len(groups) is 0:
+            return []
+        keys = SortedUnique(np.concatenate([k*loopCount +self.LoopsOfVerts(indices) for k, indices in enumerate(groups)]))
+        if edgeMask is not None:
+            #nodes on other edges could only ever be invalid
+            keys = keys[edgeMask[self.loopEdges[keys %loopCount]]]
+        if len(keys) is 0:
+            return []
+        gids, loops = keys //loopCount, keys %loopCount
+        
+        ev = self.edgeVerts[self.loopEdges[loops]]
+        notValence3 = self.valence != 3
+        if len(groups) is 1:
+            member = np.zeros(n, dtype=bool)
+            member[groups[0]] = True
+            member &= notValence3
+            valid = member[ev[:, 0]] & member[ev[:, 1]]
+        else:
+            #vertex v of group k is k*n +v, membership of any pair is one search
+            members = SortedUnique(np.concatenate([k*n +indices for k, indices in enumerate(groups)]))
+            def InGroup(gids, verts):
+                search = gids*n +verts
+                found = np.minimum(np.searchsorted(members, search), len(members) -1)
+                return members[found] == search
+            valid = notValence3[ev[:, 0]] & notValence3[ev[:, 1]] & InGroup(gids, ev[:, 0]) & InGroup(gids, ev[:, 1])
+        
+        succ = self.loopSucc[loops]
+        nodeEdges = self.loopEdges[loops]
+        search = gids*loopCount +succ
+        found = np.minimum(np.searchsorted(keys, search), len(keys) -1)
+        nextNodes = np.where((succ >= 0) & (keys[found] == search), found, -2)
+        nextNodes[nextNodes >= 0] = np.where(valid[nextNodes[nextNodes >= 0]], nextNodes[nextNodes >= 0], -2)
+        nextNodes[succ < 0] = -1
+        nextEdges = np.where(succ >= 0, self.loopEdges[succ], -1)
+        
+        #a loop has one previous loop so walks are plain paths or rings, the end of a path points to
+        #itself so hops of a path settle on its end while hops of a ring keep going around
+        count = len(keys)
+        isEnd = nextNodes < 0
+        hop = np.where(isEnd, np.arange(count), nextNodes)
+        lowest = np.arange(count)
+        ended = isEnd.sum()
+        span = 1
+        while span < count:
+            lowered = np.minimum(lowest, lowest[hop])
+            hop = hop[hop]
+            span *= 2
+            #a pass that ends no more paths and lowers no label on a ring leaves every later pass the same
+            reached = isEnd[hop].sum()
+            settled = reached == ended and (lowered == lowest).all()
+            lowest, ended = lowered, reached
+            if settled:
+                break
+        onRing = ~isEnd[hop]
+        
+        #walks also stop on reaching their start edge again, only possible where a chain repeats an edge
+        label = np.where(onRing, lowest, hop)
+        pairs = label[valid]*len(self.edgeVerts) +nodeEdges[valid]
+        uniquePairs, pairFirsts, pairCounts = UniqueCounts(pairs)
+        irregular = np.zeros(count, dtype=bool)
+        irregular[valid] = IsIn(label[valid], uniquePairs[pairCounts > 1] //len(self.edgeVerts))
+        
+        cyclics = {}
+        def Add(verts):
+            verts = SortedUnique(verts)
+            cyclics[verts.tobytes()] = verts
+        
+        #a ring walk covers the whole ring from any of its starts and ends on the node before it,
+        #edges across flipped faces share no vertex so the ring counts if any start meets its end
+        ringNodes = (valid & onRing & ~irregular).nonzero()[0]
+        ringNodes = ringNodes[np.argsort(label[ringNodes], kind="mergesort")]
+        ends, starts = self.edgeVerts[nodeEdges[ringNodes]], self.edgeVerts[nodeEdges[nextNodes[ringNodes]]]
+        meets = (starts[:, :1] == ends).any(axis=1) | (starts[:, 1:] == ends).any(axis=1)
+        labels, firsts, sizes = UniqueCounts(label[ringNodes])
+        for first, size in zip(firsts.tolist(), sizes.tolist()):
+            if size > 2 and meets[first:first +size].any():
+                Add(ends[first:first +size].ravel())
+        
+        #a path walk runs to the end of its path, it counts if that end is open and meets the start
+        second = np.where(isEnd, 0, nextNodes)
+        longer = ~isEnd & ~isEnd[second]
+        pathStarts = (valid & ~onRing & ~irregular & (nextNodes[hop] == -1) & longer).nonzero()[0]
+        first, end = self.edgeVerts[nodeEdges[pathStarts]], self.edgeVerts[nodeEdges[hop[pathStarts]]]
+        sharesVert = (first[:, :1] == end).any(axis=1) | (first[:, 1:] == end).any(axis=1)
+        for k in pathStarts[sharesVert].tolist():
+            Add(self.edgeVerts[nodeEdges[self.Walk(nextNodes, k)]].ravel())
+        
+        for walked in self.WalkIrregular(irregular.nonzero()[0], nextNodes, nodeEdges, nextEdges):
+            Add(self.edgeVerts[nodeEdges[walked]].ravel())
+        return list(cyclics.values())
+    
+    def Walk(self, nextNodes, node):
+        walked = [node]
+        while nextNodes[walked[-1]] >= 0:
+            walked.append(nextNodes[walked[-1]])
+        return walked
+    
+    def WalkIrregular(self, starts, nextNodes, nodeEdges, nextEdges):
+        """Nodes of accepted walks from starts, stepped one edge at a time like walk_edgeloop_loops"""
+        accepted = []
+        for k in starts.tolist():
+            walked = [k]
+            startEdge = nodeEdges[k]
+            for step in range(len(nextNodes)):
+                c = walked[-1]
+                if nextEdges[c] == startEdge or nextNodes[c] == -1:
+                    break
+                if nextNodes[c] == -2:
+                    walked = None
+                    break
+                walked.append(nextNodes[c])
+            else: walked = None     #never ends, bmesh walker would not return either
+            if walked is None or len(walked) <= 2:
+                continue
+            first, end = self.edgeVerts[startEdge], self.edgeVerts[nodeEdges[walked[-1]]]
+            if first[0] in end or first[1] in end:
+                accepted.append(walked)
+        return accepted
+    
+    def LockableLoops(self, tolerance = 1e-4, margin = 0.0):
+        """Vertex index arrays of cyclic loops IsLockableLoop accepts, out of all valence 4 vertices of the mesh
+        
+        Needs co. Ordered by lowest vertex index like FindLockableLoops.
+        """
+        n = self.vertCount
+        if not hasattr(self, "vertNeighbours"):
+            #neighbours of v from vertNeighbourStart[v] on, through the edge end at the same place of vertNeighbourOrder
+            self.vertNeighbourOrder = np.argsort(self.edgeVerts.ravel(), kind="mergesort")
+            self.vertNeighbours = self.edgeVerts[:, ::-1].ravel()[self.vertNeighbourOrder]
+            self.vertNeighbourStart = np.cumsum(self.valence) -self.valence
+        valence4 = (self.valence == 4).nonzero()[0]
+        slots = self.vertNeighbourStart[valence4][:, None] +np.arange(4)
+        toNeighbours = self.co[self.vertNeighbours[slots]] -self.co[valence4][:, None]
+        lengths = np.einsum("ijk,ijk->ij", toNeighbours, toNeighbours)
+        
+        #a loop edge to one neighbour leaves two of the other three as ends, edges where no such
+        #pair has both vertices between it are on no lockable loop and walks skip them. SitsBetween
+        #from dot products alone, with some slack for rounding as loops found get checked again
+        pairs = [(0, 1), (0, 2), (0, 3), (1, 2), (1, 3), (2, 3)]
+        between, slack = [], 1e-9
+        for a, b in pairs:
+            dot = np.einsum("ij,ij->i", toNeighbours[:, a], toNeighbours[:, b])
+            dd = lengths[:, a] +lengths[:, b] -2*dot
+            td = lengths[:, a] -dot
+            between.append((dd > 0) & (lengths[:, a]*dd -td*td <= (tolerance*tolerance +slack)*dd*dd) &
+                           (td > (margin -slack)*dd) & (td < (1 -margin +slack)*dd))
+        endOk = np.zeros(2*len(self.edgeVerts), dtype=bool)
+        for i in range(4):
+            endOk[self.vertNeighbourOrder[slots[:, i]]] = np.any([ok for ok, pair in zip(between, pairs) if i not in pair], axis=0)
+        edgeMask = endOk.reshape(-1, 2).all(axis=1)
+        
+        loops = self.CyclicLoopArrays([SortedUnique(self.edgeVerts[edgeMask].ravel())], edgeMask)
+        if len(loops) is 0:
+            return []
+        loops.sort(key=lambda loop: loop[0])
+        sizes = np.array([len(loop) for loop in loops])
+        loopIds, verts = np.repeat(np.arange(len(loops)), sizes), np.concatenate(loops)
+        
+        #4 neighbours of every loop vertex, 2 of them on the loop and the other 2 its ends
+        neighbours = self.vertNeighbours[self.vertNeighbourStart[verts][:, None] +np.arange(4)]
+        owner = np.full(n, -1, dtype=np.intp)
+        owner[verts] = loopIds
+        onLoop = owner[neighbours] == loopIds[:, None]
+        #owner holds one of the loops of vertices where loops cross, search those rows by loop and vertex
+        crossing = (np.bincount(verts, minlength=n) > 1)[neighbours].any(axis=1)
+        if crossing.any():
+            keys = np.sort(loopIds*n +verts)
+            search = loopIds[crossing][:, None]*n +neighbours[crossing]
+            onLoop[crossing] = keys[np.minimum(np.searchsorted(keys, search), len(keys) -1)] == search
+        twoEnds = onLoop.sum(axis=1) == 2
+        
+        ends = np.zeros((len(verts), 2), dtype=np.intp)
+        ends[twoEnds] = neighbours[twoEnds][~onLoop[twoEnds]].reshape(-1, 2)
+        between = twoEnds & SitsBetween(self.co[verts], self.co[ends[:, 0]], self.co[ends[:, 1]], tolerance, margin)
+        rejected = np.bincount(loopIds, weights=~between, minlength=len(loops))
+        return [loops[k] for k in (rejected == 0).nonzero()[0].tolist()]
+    
+    def FindAllCyclicLoops(self, groupVerts, verts):
+        """Like FindAllCyclicLoops, verts is a lookup by index of the mesh the arrays came from"""
+        groups = [[v.index for v in groupVerts[g]] for g in groupVerts]
+        return set(frozenset(verts[i] for i in loop) for loop in self.FindCyclicLoops(groups))
+
+def SitsBetween(co, end1, end2, tolerance, margin):
+    """If co lies on the line between end1 and end2
+    
+    At most tolerance of the end distance off the line and more than margin
+    of it away from both ends. Takes (N, 3) arrays too, then gives a bool array.
+    """
+    if np is not None and isinstance(co, np.ndarray):
+        d, rel = end2 -end1, co -end1
+        dd = np.einsum("ij,ij->i", d, d)
+        t = np.einsum("ij,ij->i", rel, d)/np.where(dd > 0, dd, 1)
+        off = rel -t[:, None]*d
+        return (dd > 0) & (np.einsum("ij,ij->i", off, off) <= tolerance*tolerance*dd) & (t > margin) & (t < 1 -margin)
+    d = [end2[k] -end1[k] for k in range(3)]
+    dd = d[0]*d[0] +d[1]*d[1] +d[2]*d[2]
+    if dd == 0:
+        return False
+    t = sum((co[k] -end1[k])*d[k] for k in range(3))/dd
+    off = [co[k] -end1[k] -t*d[k] for k in range(3)]
+    return off[0]*off[0] +off[1]*off[1] +off[2]*off[2] <= tolerance*tolerance*dd and margin < t < 1 -margin
+
+def IsLockableLoop(verts, tolerance = 1e-4, margin = 0.0):
+    """If every vertex of the loop has valence 4 and sits between its two ends like AdjInfoForVertex locks it"""
+    inLoop = set(verts)
+    for v in verts:
+        if len(v.link_edges) is not 4:
+            return False
+        ends = AdjacentVerts(v, inLoop)
+        if len(ends) is not 2 or not SitsBetween(v.co, ends[0].co, ends[1].co, tolerance, margin):
+            return False
+    return True
+
+def FindLockableLoops(verts, tolerance = 1e-4, margin = 0.0):
+    """Cyclic loops among verts IsLockableLoop accepts, one walk at a time, ordered by lowest vertex index"""
+    valence4 = [v for v in verts if len(v.link_edges) is 4]
+    loops = [loop for loop in FindCyclicLoops(valence4) if IsLockableLoop(loop, tolerance, margin)]
+    return sorted(loops, key = lambda loop: min(v.index for v in loop))
+
+def OpenClosedChains(loops, locked = ()):
+    """Drops loops until no chain of loops, each ending on the next, closes on itself, returns (kept, dropped count)
+    
+    A closed chain (every ring of a torus) has no end left to lock to.
+    locked loops take part but never get dropped.
+    """
+    loops = list(loops)
+    dropped = 0
+    while True:
+        chains = list(locked) +loops
+        owner = {}
+        for k, loop in enumerate(chains):
+            for v in loop:
+                owner[v] = k
+        parent = list(range(len(chains)))
+        def Find(k):
+            while parent[k] != k:
+                parent[k] = parent[parent[k]]
+                k = parent[k]
+            return k
+        outside = set()
+        for k, loop in enumerate(chains):
+            inLoop = set(loop)
+            for v in loop:
+                for e in AdjacentVerts(v, inLoop):
+                    if e in owner:
+                        parent[Find(k)] = Find(owner[e])
+                    else: outside.add(k)
+        opened = set(Find(k) for k in outside)
+        #last new loop of every closed chain
+        last = {}
+        for k in range(len(locked), len(chains)):
+            if Find(k) not in opened:
+                last[Find(k)] = k -len(locked)
+        if len(last) is 0:
+            return loops, dropped
+        drop = set(last.values())
+        loops = [loop for k, loop in enumerate(loops) if k not in drop]
+        dropped += len(drop)
+
+def GroupName(g):
+    return getattr(g, "name", str(g))
+
+def Distance(a, b):
+    return math.sqrt((a[0] -b[0])**2 +(a[1] -b[1])**2 +(a[2] -b[2])**2)
+
+def AdjacentVerts(v, exclude = ()):    
+    adjacent = []
+    for e in v.link_edges:
+        if e.other_vert(v) not in exclude:
+            adjacent.append(e.other_vert(v))
+    return adjacent
+        
+@Profiled("GetAdjInfos", lambda adjInfos, *args: len(adjInfos))
+def GetAdjInfos(groupVerts, remainders = {}):
+    adjInfos = []
+    for g in groupVerts:
+        verts = groupVerts[g] + remainders.get(g, [])
+        inGroup = set(verts)
+        for v in verts:
+            adj = AdjacentVerts(v, inGroup)
+            if len(adj) is 2:
+                aifv = AdjInfoForVertex(v, adj[0], adj[1], g)
+                adjInfos.append(aifv)
+    return adjInfos
+
+class AdjInfoForVertex(object):
+    __slots__ = ("target", "end1", "end2", "loop", "ratioToEnd1")
+    def __init__(self, target, end1, end2, loop = None):
+        self.target = target
+        self.end1 = end1
+        self.end2 = end2
+        self.loop = loop    #group the target was locked from
+        self.UpdateRatio()
+       
+    def UpdateRatio(self):
+        end1ToTarget = Distance(self.end1.co, self.target.co)
+        end1ToEnd2 = Distance(self.end1.co, self.end2.co)
+        self.ratioToEnd1 = end1ToTarget/end1ToEnd2; #0 is end1, 1 is end2
+       
+    def LockTargetOnEdge(self):
+        # c = a + r(b -a), records get validated once per tick so stale verts raise
+        a, b, r = self.end1.co, self.end2.co, self.ratioToEnd1
+        self.target.co = (a[0] +r*(b[0] -a[0]), a[1] +r*(b[1] -a[1]), a[2] +r*(b[2] -a[2]))
+        #custom data follows in batches, see DataLerp
+        
+@Profiled("LockVertsOnEdge", lambda result, adjInfos: len(adjInfos))
+def LockVertsOnEdge(adjInfos):
+    for i in adjInfos:
+        i.LockTargetOnEdge()
+
+def OpenCycleRecords(adjInfos):
+    """adjInfos locking each other in a cycle, without groups of them that have no end outside (those could only collapse)"""
+    targets = set(i.target for i in adjInfos)
+    parent = {}
+    def Find(v):
+        while parent.get(v, v) != v:
+            parent[v] = parent.get(parent[v], parent[v])
+            v = parent[v]
+        return v
+    for i in adjInfos:
+        for e in (i.end1, i.end2):
+            if e in targets:
+                a, b = Find(i.target), Find(e)
+                if a != b:
+                    parent[a] = b
+    opened = set(Find(i.target) for i in adjInfos if i.end1 not in targets or i.end2 not in targets)
+    return [i for i in adjInfos if Find(i.target) in opened]
+
+def SettleVertsOnEdge(adjInfos, tolerance = 1e-8, sweeps = 1000):
+    """Sweeps records locking each other in a cycle until no target moves more than tolerance (relative), returns sweeps done
+    
+    Groups of them with no end outside are left alone, see OpenCycleRecords.
+    """
+    adjInfos = OpenCycleRecords(adjInfos)
+    for sweep in range(sweeps):
+        settled = True
+        for i in adjInfos:
+            old = i.target.co[:]
+            i.LockTargetOnEdge()
+            new = i.target.co
+            for k in range(3):
+                if abs(new[k] -old[k]) > tolerance*(1.0 +abs(new[k])):
+                    settled = False
+        if settled:
+            return sweep +1
+    return sweeps
+
+def IndexTargetRecords(targetRecords, table, first = 0):
+    """Adds records of a RecordTable from first on to targetRecords, dict[target index] = [(end1, end2, ratioToEnd1)]"""
+    columns = (table.targets, table.ends1, table.ends2, table.ratios)
+    for record in zip(*[c[first:] for c in columns]):
+        targetRecords.setdefault(record[0], []).append(record[1:])
+    return targetRecords
+
+def DeselectTargets(verts, targetRecords, candidates = None):
+    """Deselects selected locked targets, returns records of them to select an end of instead
+    
+    verts is the vertex lookup the indices of targetRecords point into,
+    candidates the indices of vertices that may have been selected, all
+    targets get checked without them.
+    """
+    if candidates is None:
+        candidates = targetRecords
+    redirected = []
+    for t in candidates:
+        records = targetRecords.get(t)
+        if records is None:
+            continue
+        v = verts[t]
+        if v.select is True:
+            v.select = False
+            redirected += records
+    return redirected
+
+def SelectEnds(verts, records):
+    """Selects the end each record's target is nearer to, by its ratio so replays pick the same as any view"""
+    for end1, end2, ratio in records:
+        verts[end1 if ratio < 0.5 else end2].select = True
+
+def RecordLevels(targets, ends1, ends2):
+    """Sorts lock records so each one only reads targets written by earlier levels
+    
+    Where loops cross or run into each other a record's end is another
+    record's target, applying levels in order converges in one pass.
+    Returns (levels, cyclic), levels being lists of record positions.
+    Records locking each other in a cycle (parallel neighbouring loops)
+    can't be ordered, they form the last level, see CycleSolver.
+    """
+    writers = {}
+    for k, t in enumerate(targets):
+        if t in writers:
+            writers[t].append(k)
+        else: writers[t] = [k]
+    
+    waitsOn = [0]*len(targets)
+    readers = [[] for t in targets]
+    for k in range(len(targets)):
+        for e in (ends1[k], ends2[k]):
+            for w in writers.get(e, ()):
+                waitsOn[k] += 1
+                readers[w].append(k)
+    
+    levels = []
+    level = [k for k in range(len(targets)) if waitsOn[k] is 0]
+    while len(level) > 0:
+        levels.append(level)
+        nextLevel = []
+        for w in level:
+            for k in readers[w]:
+                waitsOn[k] -= 1
+                if waitsOn[k] is 0:
+                    nextLevel.append(k)
+        level = nextLevel
+    
+    cyclic = [k for k in range(len(targets)) if waitsOn[k] > 0]
+    if len(cyclic) > 0:
+        levels.append(cyclic)
+    return levels, len(cyclic)
+
+def OrderRecords(adjInfos):
+    """adjInfos in dependency order for LockVertsOnEdge, returns (ordered, cyclic)"""
+    levels, cyclic = RecordLevels([i.target for i in adjInfos], [i.end1 for i in adjInfos], [i.end2 for i in adjInfos])
+    return [adjInfos[k] for level in levels for k in level], cyclic
+
+class CycleSolver(object):
+    """Records of the cyclic level solved as linear systems, one per group of records that lock one another
+    
+    Targets that are ends of other records are the unknowns, each of their
+    records says x = (1 -r)*end1 +r*end2, targets of several records take
+    the mean. Groups up to directLimit unknowns keep their inverse and get
+    solved in one stacked product per size, bigger ones are iterated until
+    they stop moving. Closed groups, with no end outside of them, could only
+    collapse to a point and are left as they are, like groups whose
+    solution is unstable. Records reading unknowns without writing any are
+    locked after from the solved positions.
+    """
+    directLimit = 64    #biggest group kept as an inverse, size^2 entries each
+    tolerance = 1e-9    #iterating stops once no unknown moves more than this, relative to their size
+    iterations = 1000
+    #an inverse entry is how far an unknown moves per unit an end moves, past
+    #this the system is next to singular and float noise would throw it around
+    maxGain = 1e6
+    #iterating diverges once a step moves more than this times the first one
+    maxGrowth = 1e6
+    
+    def __init__(self, records, targetSlots, end1, end2, ratios):
+        self.records = records      #positions in the solver
+        slots, e1, e2 = targetSlots[records], end1[records], end2[records]
+        self.unknowns = SortedUnique(slots[slots >= 0])
+        n = len(self.unknowns)
+        def Local(a):
+            found = np.minimum(np.searchsorted(self.unknowns, a), n -1)
+            return np.where(self.unknowns[found] == a, found, -1)
+        t, a, b = Local(slots), Local(e1), Local(e2)
+        self.targetUnknowns = t
+        
+        #groups of unknowns joined by every record touching two of them
+        parent = list(range(n))
+        def Find(u):
+            while parent[u] != u:
+                parent[u] = parent[parent[u]]
+                u = parent[u]
+            return u
+        for ids in zip(t.tolist(), a.tolist(), b.tolist()):
+            ids = [u for u in ids if u >= 0]
+            for u in ids[1:]:
+                parent[Find(u)] = Find(ids[0])
+        roots = np.array([Find(u) for u in range(n)], dtype=np.intp)
+        groups, firsts, sizes = UniqueCounts(roots)
+        self.groupCount = len(groups)
+        self.unknownGroups = np.searchsorted(groups, roots)
+        self.recordGroups = self.unknownGroups[np.where(t >= 0, t, np.where(a >= 0, a, b))]
+        
+        #x_t -w(1 -r)x_e1 -w*r*x_e2 = known part, moved to b
+        eq = (t >= 0).nonzero()[0]
+        rows = t[eq]
+        weight = 1.0/np.bincount(rows, minlength=n)[rows]
+        r = ratios[records[eq]].ravel()
+        coefs = np.concatenate((weight*(1 -r), weight*r))
+        cols = np.concatenate((a[eq], b[eq]))
+        ends = np.concatenate((e1[eq], e2[eq]))
+        rows = np.concatenate((rows, rows))
+        known = cols < 0
+        self.knownRows, self.knownSlots, self.knownCoefs = rows[known], ends[known], coefs[known]
+        rows, cols, coefs = rows[~known], cols[~known], coefs[~known]
+        
+        #position of every unknown in its group, groups of one size stacked
+        order = np.argsort(self.unknownGroups, kind="mergesort")
+        position = np.empty(n, dtype=np.intp)
+        position[order] = np.arange(n) -np.repeat(np.cumsum(sizes) -sizes, sizes)
+        self.closed = np.bincount(self.unknownGroups[self.knownRows], minlength=self.groupCount) == 0
+        self.stacks, self.iterated = [], []
+        for size in SortedUnique(sizes).tolist():
+            ids = ((sizes == size) & ~self.closed).nonzero()[0]
+            if len(ids) is 0:
+                continue
+            index = np.empty((len(ids), size), dtype=np.intp)
+            slot = np.full(self.groupCount, -1, dtype=np.intp)
+            slot[ids] = np.arange(len(ids))
+            inStack = slot[self.unknownGroups] >= 0
+            index[slot[self.unknownGroups[inStack]], position[inStack]] = inStack.nonzero()[0]
+            if size > self.directLimit:
+                for k, g in enumerate(ids.tolist()):
+                    inGroup = self.unknownGroups[rows] == g
+                    self.iterated.append((g, index[k], rows[inGroup], cols[inGroup], coefs[inGroup]))
+                continue
+            matrices = np.zeros((len(ids), size, size))
+            matrices[:, np.arange(size), np.arange(size)] = 1.0
+            use = slot[self.unknownGroups[rows]] >= 0
+            np.subtract.at(matrices, (slot[self.unknownGroups[rows[use]]], position[rows[use]], position[cols[use]]), coefs[use])
+            try:
+                inverses = np.linalg.inv(matrices)
+            except np.linalg.LinAlgError:
+                inverses = np.array([np.linalg.pinv(m) for m in matrices])
+            #next to singular, a cycle inside barely reaches an end
+            unstable = np.abs(inverses).reshape(len(ids), -1).max(axis=1) > self.maxGain
+            unstable |= ~np.isfinite(inverses).reshape(len(ids), -1).all(axis=1)
+            self.closed[ids[unstable]] = True
+            if not unstable.all():
+                self.stacks.append((ids[~unstable], index[~unstable], inverses[~unstable]))
+    
+    def Solve(self, co, dirtyGroups):
+        """Moves unknowns of dirty groups in co (end coords) to where their records put them"""
+        b = np.zeros((len(self.unknowns), 3))
+        np.add.at(b, self.knownRows, self.knownCoefs[:, None]*co[self.knownSlots])
+        for ids, index, inverses in self.stacks:
+            dirty = dirtyGroups[ids]
+            if not dirty.any():
+                continue
+            index = index[dirty]
+            x = np.einsum("mij,mjc->mic", inverses[dirty], b[index])
+            co[self.unknowns[index.ravel()]] = x.reshape(-1, 3)
+        for g, index, rows, cols, coefs in self.iterated:
+            if not dirtyGroups[g]:
+                continue
+            x = co[self.unknowns].copy()
+            first = None
+            for step in range(self.iterations):
+                nx = b.copy()
+                np.add.at(nx, rows, coefs[:, None]*x[cols])
+                change = np.abs(nx[index] -x[index]).max()
+                x[index] = nx[index]
+                if change <= self.tolerance*(1.0 +np.abs(x[index]).max()):
+                    break
+                first = change if first is None else first
+                #ratios past the ends can make it grow instead, leave it be
+                if not change < first*self.maxGrowth:
+                    x[index] = co[self.unknowns[index]]
+                    break
+            co[self.unknowns[index]] = x[index]
+
+class RecordTable(object):
+    """Lock records as vertex indices and ratios, what LockSolver, deselecting and the topology cache work from
+    
+    refs keeps the vertex each index was taken from, vertices die on
+    topology edits and undo and IsValid checks all of them at once before
+    a pass instead of records failing one by one. Once valid refs is the
+    lookup records get resolved through.
+    """
+    __slots__ = ("targets", "ends1", "ends2", "ratios", "loops", "vertCount", "refs")
+    def __init__(self, vertCount):
+        self.targets = array.array('i')
+        self.ends1 = array.array('i')
+        self.ends2 = array.array('i')
+        self.ratios = array.array('d')
+        self.loops = []
+        self.vertCount = vertCount
+        self.refs = {}      #dict[index] = vertex found there
+    
+    def __len__(self):
+        return len(self.targets)
+    
+    def Extend(self, adjInfos):
+        """Appends records, vertex indices have to be up to date"""
+        for i in adjInfos:
+            for v in (i.target, i.end1, i.end2):
+                self.refs[v.index] = v
+            self.targets.append(i.target.index)
+            self.ends1.append(i.end1.index)
+            self.ends2.append(i.end2.index)
+            self.ratios.append(i.ratioToEnd1)
+            self.loops.append(i.loop)
+    
+    def RemoveRange(self, first, count):
+        for a in (self.targets, self.ends1, self.ends2, self.ratios, self.loops):
+            del a[first:first +count]
+    
+    def IsValid(self, verts, full = True):
+        """If verts (vertex lookup of the mesh) still has the count records were taken from and, when full, their vertices at their indices"""
+        if len(verts) != self.vertCount:
+            return False
+        return not full or all(map(operator.eq, map(verts.__getitem__, self.refs.keys()), self.refs.values()))
+
+def BuildRecordTable(bm, adjInfos):
+    bm.verts.index_update()
+    table = RecordTable(len(bm.verts))
+    table.Extend(adjInfos)
+    return table
+
+class LockSolver(object):
+    """Array form of a RecordTable, locks all targets in one read-compute-write pass
+    
+    Vertices are kept as indices into the lookup each call gets. Adding and
+    removing a loop only touches its records and the ones that read its
+    targets: levels are kept per record and redone for those, ends no record
+    reads any more stay in place until they are most of them.
+    """
+    def __init__(self, table, verts):
+        #every end is read once per tick even if shared by many targets
+        self.slots = {}
+        self.ends = []
+        self.endUses = np.zeros(0, dtype=np.intp)  #records reading each end
+        self.targets = []
+        self.targetLoops = {}   #dict[target] = [loop slots, it is a target of]
+        self.targetSlots = np.zeros(0, dtype=np.intp)
+        self.end1 = np.zeros(0, dtype=np.intp)
+        self.end2 = np.zeros(0, dtype=np.intp)
+        self.ratios = np.zeros((0, 1))
+        self.recordLevels = np.zeros(0, dtype=np.intp)     #-1 for the cyclic level
+        self.loopSlots = {}
+        self.slotCount = 0
+        self.loops = np.zeros(0, dtype=np.intp)  #non decreasing, records of one loop are next to each other
+        self.snapshot = None    #end coords seen last tick, float32 like mesh coords
+        self.cycles = None
+        self.cyclic = 0
+        self.AddRecords(table, verts)
+    
+    def Slot(self, v):
+        if v not in self.slots:
+            self.slots[v] = len(self.ends)
+            self.ends.append(v)
+        return self.slots[v]
+    
+    def LoopSlot(self, loop):
+        if loop not in self.loopSlots:
+            self.loopSlots[loop] = self.slotCount
+            self.slotCount += 1
+        return self.loopSlots[loop]
+    
+    def FirstRecord(self, loop):
+        """(position of the first record of loop, record count), (0, 0) for loops it doesn't know"""
+        slot = self.loopSlots.get(loop)
+        if slot is None:
+            return 0, 0
+        first = int(np.searchsorted(self.loops, slot))
+        return first, int(np.searchsorted(self.loops, slot, side="right")) -first
+    
+    def Readers(self, slots):
+        """Positions of records with an end in slots"""
+        return (IsIn(self.end1, slots) | IsIn(self.end2, slots)).nonzero()[0]
+    
+    def Relevel(self, seeds):
+        """Levels again records in seeds and every record reading their targets, like RecordLevels would
+        
+        Returns if any of them was or now is in the cyclic level.
+        """
+        affected = np.zeros(len(self.targets), dtype=bool)
+        affected[seeds] = True
+        frontier = np.asarray(seeds, dtype=np.intp)
+        while len(frontier) > 0:
+            slots = self.targetSlots[frontier]
+            readers = self.Readers(slots[slots >= 0])
+            frontier = readers[~affected[readers]]
+            affected[frontier] = True
+        
+        #writers of a slot are a run of records sorted by target slot
+        order = np.argsort(self.targetSlots, kind="mergesort")
+        sortedSlots = self.targetSlots[order]
+        records = affected.nonzero()[0]
+        ends = np.concatenate((self.end1[records], self.end2[records]))
+        starts, stops = np.searchsorted(sortedSlots, ends), np.searchsorted(sortedSlots, ends, side="right")
+        
+        levels = self.recordLevels
+        n = len(records)
+        waitsOn, base, readers = {}, {}, {}
+        for k, r in enumerate(records.tolist()):
+            waits, level = 0, 0
+            for s in (k, k +n):
+                for w in order[starts[s]:stops[s]].tolist():
+                    if affected[w]:
+                        waits += 1
+                        readers.setdefault(w, []).append(r)
+                    #reading the cyclic level puts it there too
+                    elif levels[w] < 0:
+                        waits += 1
+                    else: level = max(level, levels[w] +1)
+            waitsOn[r], base[r] = waits, level
+        
+        wasCyclic = (levels[records] < 0).any()
+        levels[records] = -1
+        ready = [r for r in records.tolist() if waitsOn[r] is 0]
+        while len(ready) > 0:
+            r = ready.pop()
+            levels[r] = base[r]
+            for k in readers.get(r, ()):
+                base[k] = max(base[k], base[r] +1)
+                waitsOn[k] -= 1
+                if waitsOn[k] is 0:
+                    ready.append(k)
+        return wasCyclic or (levels[records] < 0).any()
+    
+    def UpdateOrder(self, rebuildCycles):
+        """levels out of recordLevels, CycleSolver of the cyclic level again if it may have changed"""
+        resolved = (self.recordLevels >= 0).nonzero()[0]
+        order = resolved[np.argsort(self.recordLevels[resolved], kind="mergesort")]
+        counts = np.bincount(self.recordLevels[resolved]) if len(resolved) > 0 else []
+        self.levels = np.split(order, np.cumsum(counts)[:-1]) if len(order) > 0 else []
+        cyclic = (self.recordLevels < 0).nonzero()[0]
+        self.cyclic = len(cyclic)
+        if self.cyclic is 0:
+            self.cycles = None
+        elif rebuildCycles or self.cycles is None:
+            self.cycles = CycleSolver(cyclic, self.targetSlots, self.end1, self.end2, self.ratios)
+        #same records, positions after a removed loop moved down
+        else: self.cycles.records = cyclic
+    
+    def AllLevels(self):
+        """Positions of every record by level, the cyclic level last"""
+        if self.cycles is None:
+            return self.levels
+        return self.levels +[self.cycles.records]
+    
+    def AddRecords(self, table, verts, first = 0):
+        """Appends records of table from first on, newly locked loops whose ratios are fresh so they start clean"""
+        targets = table.targets[first:].tolist()
+        count, start, endCount = len(targets), len(self.targets), len(self.ends)
+        self.targets += targets
+        self.end1 = np.concatenate((self.end1, np.array([self.Slot(v) for v in table.ends1[first:]], dtype=np.intp)))
+        self.end2 = np.concatenate((self.end2, np.array([self.Slot(v) for v in table.ends2[first:]], dtype=np.intp)))
+        self.endUses = np.concatenate((self.endUses, np.zeros(len(self.ends) -endCount, dtype=np.intp)))
+        np.add.at(self.endUses, self.end1[start:], 1)
+        np.add.at(self.endUses, self.end2[start:], 1)
+        ratios = np.array(table.ratios[first:], dtype=np.float64)
+        ratios.shape = (count, 1)
+        self.ratios = np.concatenate((self.ratios, ratios))
+        loops = np.array([self.LoopSlot(g) for g in table.loops[first:]], dtype=np.intp)
+        self.loops = np.concatenate((self.loops, loops))
+        for t, slot in zip(targets, loops.tolist()):
+            owners = self.targetLoops.setdefault(t, [])
+            if slot not in owners:
+                owners.append(slot)
+        
+        #new records and older ones whose target just became an end
+        self.targetSlots = np.concatenate((self.targetSlots, np.array([self.slots.get(t, -1) for t in targets], dtype=np.intp)))
+        for k, v in enumerate(self.ends[endCount:]):
+            for r in self.LoopRecords(self.targetLoops.get(v, ()), v):
+                self.targetSlots[r] = endCount +k
+        self.recordLevels = np.concatenate((self.recordLevels, np.zeros(count, dtype=np.intp)))
+        if self.snapshot is not None:
+            self.snapshot = np.concatenate((self.snapshot, self.ReadEnds(verts, endCount).astype(np.float32)))
+        self.UpdateOrder(self.Relevel(np.arange(start, len(self.targets))))
+    
+    def LoopRecords(self, loopSlots, v):
+        """Positions of records of loopSlots that lock v"""
+        found = []
+        for slot in loopSlots:
+            first = int(np.searchsorted(self.loops, slot))
+            stop = int(np.searchsorted(self.loops, slot, side="right"))
+            found += [r for r in range(first, stop) if self.targets[r] == v]
+        return found
+    
+    def RemoveLoop(self, loop):
+        """Drops records of loop, ends no other record reads are dropped once they are most of them"""
+        first, count = self.FirstRecord(loop)
+        slot = self.loopSlots.pop(loop, None)
+        if slot is None:
+            return
+        stop = first +count
+        for v in set(self.targets[first:stop]):
+            owners = self.targetLoops[v]
+            owners.remove(slot)
+            if len(owners) is 0:
+                del self.targetLoops[v]
+        np.subtract.at(self.endUses, self.end1[first:stop], 1)
+        np.subtract.at(self.endUses, self.end2[first:stop], 1)
+        written = self.targetSlots[first:stop]
+        written = written[written >= 0]
+        wasCyclic = bool((self.recordLevels[first:stop] < 0).any())
+        
+        del self.targets[first:stop]
+        keep = np.ones(len(self.end1), dtype=bool)
+        keep[first:stop] = False
+        self.end1, self.end2, self.targetSlots = self.end1[keep], self.end2[keep], self.targetSlots[keep]
+        self.ratios, self.loops, self.recordLevels = self.ratios[keep], self.loops[keep], self.recordLevels[keep]
+        
+        #readers of its targets lost a writer
+        compacted = self.Compact()
+        if compacted is not None:
+            written = compacted[written]
+            written = written[written >= 0]
+        changed = self.Relevel(self.Readers(written))
+        self.UpdateOrder(changed or wasCyclic or compacted is not None)
+    
+    def Compact(self):
+        """Drops ends no record reads once they outnumber the rest, returns old to new slot (-1 dropped) or None"""
+        unused = self.endUses == 0
+        if np.count_nonzero(unused) <= max(len(self.ends)//2, 16):
+            return None
+        used = ~unused
+        remap = np.where(used, np.cumsum(used) -1, -1)
+        self.end1, self.end2 = remap[self.end1], remap[self.end2]
+        self.targetSlots = np.where(self.targetSlots >= 0, remap[self.targetSlots], -1)
+        self.ends = [v for v, u in zip(self.ends, used.tolist()) if u]
+        self.slots = dict((v, k) for k, v in enumerate(self.ends))
+        self.endUses = self.endUses[used]
+        if self.snapshot is not None:
+            self.snapshot = self.snapshot[used]
+        return remap
+        
+    def ReadEnds(self, verts, first = 0):
+        return GetVertsCo([verts[i] for i in self.ends[first:]])
+    
+    def DirtyRecords(self, moved, records):
+        """Those of records whose loop has at least one end moved"""
+        dirtyLoops = np.zeros(self.slotCount, dtype=bool)
+        dirtyLoops[self.loops[moved[self.end1] | moved[self.end2]]] = True
+        return records[dirtyLoops[self.loops[records]]]
+    
+    @Profiled("LockSolver.Solve", lambda written, solver, *args: written)
+    def Solve(self, verts, adjInfos = None):
+        """Locks targets of moved loops level by level, returns how many vertices were written
+        
+        verts is the vertex lookup of the table's indices. Records written are
+        left in solved, one array per level. Given the adjInfos the solver was
+        built from, dirty ones lock themselves one by one instead of in bulk.
+        """
+        self.solved = []
+        if not self.targets:
+            return 0
+        co = self.ReadEnds(verts)
+        #mesh coords are float32, what got written reads back rounded
+        if self.snapshot is None:
+            moved = np.ones(len(co), dtype=bool)
+        else: moved = np.any(co.astype(np.float32) != self.snapshot, axis=1)
+        
+        written = 0
+        targets = self.targets
+        self.solved = []
+        for level in self.levels:
+            if not moved.any():
+                break
+            dirty = self.DirtyRecords(moved, level)
+            if len(dirty) is 0:
+                continue
+            self.solved.append(dirty)
+            written += len(dirty)
+            slots = self.targetSlots[dirty]
+            isEnd = slots >= 0
+            if adjInfos is not None:
+                LockVertsOnEdge([adjInfos[i] for i in dirty.tolist()])
+                co[slots[isEnd]] = GetVertsCo([verts[targets[i]] for i in dirty[isEnd].tolist()])
+                moved[slots[isEnd]] = True
+                continue
+            
+            # c = a + r(b -a)
+            a, b = co[self.end1[dirty]], co[self.end2[dirty]]
+            locked = a +self.ratios[dirty]*(b -a)
+            for i, c in zip(dirty.tolist(), locked.tolist()):
+                verts[targets[i]].co = c
+            
+            #targets that are ends of later levels, they read the new position
+            co[slots[isEnd]] = locked[isEnd]
+            moved[slots[isEnd]] = True
+        if self.cycles is not None and moved.any():
+            written += self.SolveCycles(co, moved, verts, adjInfos)
+        #written positions count as seen so they don't dirty the next tick
+        self.snapshot = co.astype(np.float32)
+        return written
+    
+    def SolveCycles(self, co, moved, verts, adjInfos = None):
+        """Solves groups of the cyclic level with a dirty record and writes all their records"""
+        cycles = self.cycles
+        dirty = self.DirtyRecords(moved, cycles.records)
+        if len(dirty) is 0:
+            return 0
+        groups = np.zeros(cycles.groupCount, dtype=bool)
+        groups[cycles.recordGroups[np.searchsorted(cycles.records, dirty)]] = True
+        groups &= ~cycles.closed
+        rows = groups[cycles.recordGroups].nonzero()[0]
+        records = cycles.records[rows]
+        self.solved.append(records)
+        if adjInfos is not None:
+            SettleVertsOnEdge([adjInfos[i] for i in records.tolist()])
+            co[cycles.unknowns] = GetVertsCo([verts[self.ends[k]] for k in cycles.unknowns.tolist()])
+            return len(records)
+        
+        cycles.Solve(co, groups)
+        a, b = co[self.end1[records]], co[self.end2[records]]
+        locked = a +self.ratios[records]*(b -a)
+        #unknowns keep the solution, their records only agree on it when they have one each
+        slots = self.targetSlots[records]
+        isEnd = slots >= 0
+        locked[isEnd] = co[slots[isEnd]]
+        for i, c in zip(records.tolist(), locked.tolist()):
+            verts[self.targets[i]].co = c
+        return len(records)
+
+def CrossFaceLoops(record):
+    """(target loop, end1 loop, end2 loop, target loop across) for faces around the target of record
+    
+    A face around the target holds one of the ends, the other end is on the
+    face across the edge it shares with the loop. Faces without that layout
+    are left out.
+    """
+    t, end1, end2 = record.target, record.end1, record.end2
+    crossed = []
+    for l in t.link_loops:
+        prev = l.link_loop_prev
+        if l.link_loop_next.vert in (end1, end2):
+            endLoop, along = l.link_loop_next, prev
+        elif prev.vert in (end1, end2):
+            endLoop, along = prev, l
+        else: continue
+        across = along.link_loop_radial_next
+        if across == along:
+            continue
+        other = end2 if endLoop.vert == end1 else end1
+        found = dict((al.vert, al) for al in across.face.loops if al.vert == t or al.vert == other)
+        if len(found) is not 2:
+            continue
+        if endLoop.vert == end1:
+            crossed.append((l, endLoop, found[other], found[t]))
+        else: crossed.append((l, found[other], endLoop, found[t]))
+    return crossed
+
+class DataLerp(object):
+    """Custom data of locked targets interpolated with the ratios of their records
+    
+    A channel holds (target, end1, end2) elements per record, vertices for
+    vertex layers or loops from CrossFaceLoops for loop layers, and reads
+    and writes one layer through read(elements) giving an (N, k) array and
+    write(elements, values). Apply only touches elements of records given.
+    Channels are keyed by layer and follow records as loops come and go.
+    """
+    def __init__(self, adjInfos):
+        self.ratios = np.array([i.ratioToEnd1 for i in adjInfos], dtype=np.float64)
+        self.channels = {}
+        self.layers = {}    #dict[key] = what read and write of the channel were made from
+    
+    def AddChannel(self, key, records, targets, ends1, ends2, read, write, layer = None):
+        """Appends elements of records to the channel of key, read and write replace the ones it had"""
+        self.layers[key] = layer
+        if key in self.channels:
+            channel = self.channels[key]
+            channel[0] = np.concatenate((channel[0], np.asarray(records, dtype=np.intp)))
+            for elements, added in zip(channel[1:4], (targets, ends1, ends2)):
+                elements.extend(added)
+            channel[4:] = read, write
+        elif len(records) > 0:
+            self.channels[key] = [np.asarray(records, dtype=np.intp), list(targets), list(ends1), list(ends2), read, write]
+    
+    def Extend(self, adjInfos):
+        """Appends ratios of records, returns the position of the first to add channel elements for"""
+        first = len(self.ratios)
+        self.ratios = np.concatenate((self.ratios, np.array([i.ratioToEnd1 for i in adjInfos], dtype=np.float64)))
+        return first
+    
+    def RemoveRange(self, first, count):
+        """Drops records first to first +count and their elements, channels are sorted by record"""
+        self.ratios = np.concatenate((self.ratios[:first], self.ratios[first +count:]))
+        for key in list(self.channels):
+            channel = self.channels[key]
+            records = channel[0]
+            start, stop = np.searchsorted(records, first), np.searchsorted(records, first +count)
+            for elements in channel[1:4]:
+                del elements[start:stop]
+            channel[0] = np.concatenate((records[:start], records[stop:] -count))
+            if len(channel[0]) is 0:
+                del self.channels[key]
+    
+    @Profiled("DataLerp.Apply", lambda written, *args: written)
+    def Apply(self, levels):
+        """Interpolates elements of records in levels, one batch per level and channel, returns elements written"""
+        written = 0
+        for level in levels:
+            dirty = np.zeros(len(self.ratios), dtype=bool)
+            dirty[level] = True
+            for records, targets, ends1, ends2, read, write in self.channels.values():
+                rows = dirty[records].nonzero()[0]
+                if len(rows) is 0:
+                    continue
+                a = read([ends1[k] for k in rows.tolist()])
+                b = read([ends2[k] for k in rows.tolist()])
+                # c = a + r(b -a) like the positions
+                write([targets[k] for k in rows.tolist()], a +self.ratios[records[rows]][:, None]*(b -a))
+                written += len(rows)
+        return written
+
+def BuildLockSolver(table, verts):
+    if np is None:
+        return None
+    return LockSolver(table, verts)
+        
+
+def ProjectToRegion(co, matrix, width, height):
+    """Projects (N, 3) coords to region pixels with one matrix multiply
+    
+    matrix takes co to clip space (perspective_matrix * matrix_world for
+    object coords). Returns (N, 2) positions and a mask of points in front
+    of the view, the others are clipped like location_3d_to_region_2d does.
+    """
+    m = np.asarray(matrix, dtype=np.float64)
+    prj = np.dot(co, m[:, :3].T) +m[:, 3]
+    w = prj[:, 3]
+    visible = w > 0.0
+    w = np.where(visible, w, 1.0)
+    
+    widthHalf, heightHalf = width/2.0, height/2.0
+    co2d = np.empty((len(co), 2))
+    co2d[:, 0] = widthHalf +widthHalf*(prj[:, 0]/w)
+    co2d[:, 1] = heightHalf +heightHalf*(prj[:, 1]/w)
+    return co2d, visible
+
+def FrustumPlanes(matrix):
+    """Unit planes (a, b, c, d) of the view frustum in the space matrix takes to clip space, positive inside"""
+    m = np.asarray(matrix, dtype=np.float64)
+    planes = np.array([m[3] +m[0], m[3] -m[0], m[3] +m[1], m[3] -m[1], m[3] +m[2], m[3] -m[2]])
+    return planes/np.sqrt((planes[:, :3]**2).sum(axis=1))[:, None]
+
+class LoopBounds(object):
+    """Coordinates and bounding sphere of each loop, read once for as long as loops stay where they are
+    
+    Rows starts[k]:ends[k] of co are loop k. Strides tells per loop how
+    much of it is worth drawing in a view so overlay work follows what is
+    on screen instead of how many loops there are.
+    """
+    segmentPixels = 3.0     #shortest segment kept when decimating
+    pointPixels = 1.5       #loops smaller across than this are drawn as a point
+    
+    def __init__(self, loops):
+        lengths = np.array([len(loop) for loop in loops], dtype=np.intp)
+        self.ends = np.cumsum(lengths)
+        self.starts = self.ends -lengths
+        self.co = GetVertsCo([v for loop in loops for v in loop])
+        if len(loops) is 0:
+            self.centers, self.radii = np.zeros((0, 3)), np.zeros(0)
+            return
+        lo = np.minimum.reduceat(self.co, self.starts)
+        hi = np.maximum.reduceat(self.co, self.starts)
+        self.centers = (lo +hi)/2
+        dist = np.sqrt(((self.co -np.repeat(self.centers, lengths, axis=0))**2).sum(axis=1))
+        self.radii = np.maximum.reduceat(dist, self.starts)
+    
+    def Strides(self, matrix, width, height):
+        """Vertex step per loop for a region, 0 for loops out of view and -1 for ones to draw as a point
+        
+        matrix takes loop coords to clip space like for ProjectToRegion.
+        Spheres outside any frustum plane are culled, the rest get their
+        size on screen from the depth of their center.
+        """
+        m = np.asarray(matrix, dtype=np.float64)
+        planes = FrustumPlanes(m)
+        inside = (np.dot(self.centers, planes[:, :3].T) +planes[:, 3] >= -self.radii[:, None]).all(axis=1)
+        
+        #pixels per unit at w = 1 along screen x and y, sphere crossing the eye plane counts as huge
+        scale = max(np.sqrt((m[0, :3]**2).sum())*width, np.sqrt((m[1, :3]**2).sum())*height)/2
+        w = np.dot(self.centers, m[3, :3]) +m[3, 3]
+        near = w > self.radii
+        pixels = np.where(near, 2*self.radii*scale/np.where(near, w, 1.0), np.inf)
+        
+        #enough vertices that segments of the loop's circumference stay segmentPixels long
+        lengths = self.ends -self.starts
+        wanted = np.maximum(3, np.ceil(np.pi*np.minimum(pixels, 1e9)/self.segmentPixels))
+        strides = np.maximum(1, lengths //wanted).astype(np.intp)
+        strides[pixels < self.pointPixels] = -1
+        strides[~inside] = 0
+        return strides
+    
+    def Loop(self, k, stride):
+        """(N, 3) coordinates of loop k, every stride-th vertex"""
+        return self.co[self.starts[k]:self.ends[k]:stride]
+
+def GetVertsCo(verts):
+    co = np.array([v.co[:] for v in verts], dtype=np.float64)
+    co.shape = (len(verts), 3)
+    return co
+
+class CoordMirror(object):
+    """float32 copy of the coordinates of verts, updated only where they moved
+    
+    Row k is verts[k], so co.ravel() goes to foreach_set("co") of a mesh
+    whose vertex k mirrors verts[k] in one write.
+    """
+    def __init__(self, verts):
+        self.verts = verts
+        self.co = None
+    
+    def Update(self):
+        """Copies coordinates that moved since last call, returns how many (all on the first)"""
+        co = GetVertsCo(self.verts).astype(np.float32)
+        if self.co is None or len(co) != len(self.co):
+            self.co = co
+            return len(co)
+        moved = (co != self.co).any(axis=1)
+        count = int(np.count_nonzero(moved))
+        if count > 0:
+            self.co[moved] = co[moved]
+        return count
+
+@Profiled("SortGroupVertsByAdjacent", lambda result, groupVerts: len(groupVerts))
+def SortGroupVertsByAdjacent(groupVerts):
+    """Orders each group along its loop, returns dict[g] = [disconnected, verts]"""
+    remainders = {}
+    for g in groupVerts:
+        #GetGroupVerts removes empty so len(groupVerts[g]) always >0
+        ordered, rest = OrderLoopVerts(groupVerts[g])
+        groupVerts[g] = ordered
+        if len(rest) > 0:
+            remainders[g] = rest
+            print("Edger: group " +GroupName(g) +" is not a single loop, " +str(len(rest)) +" vertices are disconnected")
+    return remainders
+
+def OrderLoopVerts(loopVerts):
+    """Walks loopVerts by adjacency from the first one, returns (ordered, disconnected)"""
+    inLoop = set(loopVerts)
+    adjacent = {}
+    for v in loopVerts:
+        adjacent[v] = [e.other_vert(v) for e in v.link_edges if e.other_vert(v) in inLoop]
+    
+    v = loopVerts[0]
+    ordered = [v]
+    visited = set(ordered)
+    while True:
+        for a in adjacent[v]:
+            if a not in visited:
+                break
+        else: break
+        ordered.append(a)
+        visited.add(a)
+        v = a
+    
+    rest = []
+    if len(ordered) != len(loopVerts):
+        rest = [v for v in loopVerts if v not in visited]
+    return ordered, rest
+    
+def GetVertLookup(bm):
+    """Vertices indexable by v.index, O(1) where bmesh has a lookup table"""
+    if hasattr(bm.verts, "ensure_lookup_table"):
+        bm.verts.ensure_lookup_table()
+        return bm.verts
+    return list(bm.verts)
+
+class MemVert(object):
+    __slots__ = ("co", "index", "select", "link_edges", "link_loops")
+    def __init__(self, co, index):
+        self.co = tuple(co)
+        self.index = index
+        self.select = False
+        self.link_edges = []
+        self.link_loops = []
+
+class MemEdge(object):
+    __slots__ = ("verts", "index", "select", "link_loops")
+    def __init__(self, v1, v2, index):
+        self.verts = (v1, v2)
+        self.index = index
+        self.select = False
+        self.link_loops = []
+    
+    @property
+    def is_manifold(self):
+        return len(self.link_loops) is 2
+    
+    def other_vert(self, v):
+        if v == self.verts[0]:
+            return self.verts[1]
+        if v == self.verts[1]:
+            return self.verts[0]
+        return None
+
+class MemLoop(object):
+    __slots__ = ("vert", "edge", "face", "link_loop_next", "link_loop_prev", "link_loop_radial_next")
+
+class MemFace(object):
+    __slots__ = ("verts", "loops", "index", "select")
+    def __init__(self, verts, index):
+        self.verts = verts
+        self.index = index
+        self.select = False
+        self.loops = []
+
+class MemSeq(list):
+    def index_update(self):
+        for i, e in enumerate(self):
+            e.index = i
+    
+    def ensure_lookup_table(self):
+        pass
+
+class MemMesh(object):
+    """In memory mesh with the bmesh subset Edger walks, built face by face"""
+    def __init__(self):
+        self.verts = MemSeq()
+        self.edges = MemSeq()
+        self.faces = MemSeq()
+        self.edgeByVerts = {}
+    
+    def AddVert(self, co):
+        v = MemVert(co, len(self.verts))
+        self.verts.append(v)
+        return v
+    
+    def AddEdge(self, v1, v2):
+        key = (v1.index, v2.index) if v1.index < v2.index else (v2.index, v1.index)
+        e = self.edgeByVerts.get(key)
+        if e is None:
+            e = MemEdge(v1, v2, len(self.edges))
+            self.edges.append(e)
+            self.edgeByVerts[key] = e
+            v1.link_edges.append(e)
+            v2.link_edges.append(e)
+        return e
+    
+    def AddFace(self, verts):
+        f = MemFace(list(verts), len(self.faces))
+        self.faces.append(f)
+        for k, v in enumerate(f.verts):
+            l = MemLoop()
+            l.vert, l.face = v, f
+            l.edge = self.AddEdge(v, f.verts[(k +1) %len(f.verts)])
+            v.link_loops.append(l)
+            l.edge.link_loops.append(l)
+            f.loops.append(l)
+        for k, l in enumerate(f.loops):
+            l.link_loop_next = f.loops[(k +1) %len(f.loops)]
+            l.link_loop_prev = f.loops[k -1]
+        #radial cycle of each edge, kept up to date as faces get added
+        for l in f.loops:
+            ring = l.edge.link_loops
+            for k, rl in enumerate(ring):
+                rl.link_loop_radial_next = ring[(k +1) %len(ring)]
+        return f
+    
+    def select_flush(self, select):
+        pass
+    
+    def Topology(self):
+        """MeshTopology of the mesh as it is now"""
+        faceStarts, faceSizes, loopVerts, loopEdges = [], [], [], []
+        for f in self.faces:
+            faceStarts.append(len(loopVerts))
+            faceSizes.append(len(f.loops))
+            for l in f.loops:
+                loopVerts.append(l.vert.index)
+                loopEdges.append(l.edge.index)
+        edgeVerts = [(e.verts[0].index, e.verts[1].index) for e in self.edges]
+        return MeshTopology(len(self.verts), edgeVerts, loopVerts, loopEdges, faceStarts, faceSizes, self.Coords())
+    
+    def Coords(self):
+        return GetVertsCo(self.verts)
+
+def InitLoops(groupVerts):
+    """What ReInit does to the groups, without vertex group storage
+    
+    Returns (loops, remainders, adjInfos) where loops is a dict like
+    groupVerts holding only the cyclic loops found, in loop order.
+    """
+    loops = {}
+    for k, verts in enumerate(FindAllCyclicLoops(groupVerts)):
+        #groups come back from storage in vertex order
+        loops[k] = sorted(verts, key = lambda v: v.index)
+    remainders = SortGroupVertsByAdjacent(loops)
+    adjInfos = GetAdjInfos(loops, remainders)
+    return loops, remainders, adjInfos
+
+traceMagic = b"EDGRTRC1"
+TRACE_REINIT, TRACE_TOPOLOGY, TRACE_LOOPS = 1, 2, 4
+
+class TraceWriter(object):
+    """Compact binary log of an edit session, the mesh it started from then what each tick got
+    
+    After the magic everything is one zlib stream. The mesh: vertex, face
+    and loop counts, float32 coordinates, face sizes and vertex indices,
+    each loop's vertex indices and the selected ones. Then per tick flags,
+    seconds the pass took, vertex count, moved vertices with their new
+    coordinates, vertices whose selection flipped and, with TRACE_LOOPS,
+    all loops again. Needs numpy.
+    """
+    def __init__(self, path, co, faces, loops, selected):
+        self.file = open(path, "wb")
+        self.file.write(traceMagic)
+        self.zip = zlib.compressobj()
+        self.ticks = 0
+        self.Write(struct.pack("<III", len(co), len(faces), len(loops)))
+        self.WriteArray(co, "<f4")
+        self.WriteArray([len(f) for f in faces], "<u4")
+        self.WriteArray([i for f in faces for i in f], "<u4")
+        self.WriteLoops(loops)
+        self.WriteCounted(selected)
+    
+    def Write(self, data):
+        self.file.write(self.zip.compress(data))
+    
+    def WriteArray(self, values, dtype):
+        self.Write(np.asarray(values, dtype=dtype).tobytes())
+    
+    def WriteCounted(self, indices):
+        self.Write(struct.pack("<I", len(indices)))
+        self.WriteArray(indices, "<u4")
+    
+    def WriteLoops(self, loops):
+        for loop in loops:
+            self.WriteCounted(loop)
+    
+    def Tick(self, flags, seconds, vertCount, moved, co, toggled, loops = None):
+        """moved and toggled are vertex indices, co the new coordinates of moved"""
+        self.Write(struct.pack("<BdIII", flags, seconds, vertCount, len(moved), len(toggled)))
+        self.WriteArray(moved, "<u4")
+        self.WriteArray(co, "<f4")
+        self.WriteArray(toggled, "<u4")
+        if flags & TRACE_LOOPS:
+            self.Write(struct.pack("<I", len(loops)))
+            self.WriteLoops(loops)
+        self.ticks += 1
+    
+    def Close(self):
+        self.file.write(self.zip.flush())
+        self.file.close()
+
+class TraceReader(object):
+    """Reads what TraceWriter wrote
+    
+    mesh is (co, faces, loops, selected) and ticks a list of (flags,
+    seconds, vertCount, moved, co, toggled, loops), loops None unless
+    flags has TRACE_LOOPS. Needs numpy.
+    """
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        if data[:len(traceMagic)] != traceMagic:
+            raise ValueError(path +" is not an Edger trace")
+        self.data = zlib.decompress(data[len(traceMagic):])
+        self.at = 0
+        
+        vertCount, faceCount, loopCount = self.Unpack("<III")
+        co = self.Array("<f4", vertCount*3).reshape(-1, 3)
+        sizes = self.Array("<u4", faceCount).tolist()
+        flat = self.Array("<u4", sum(sizes)).tolist()
+        starts = [0] +list(itertools.accumulate(sizes))
+        faces = [flat[starts[k]:starts[k +1]] for k in range(faceCount)]
+        self.mesh = (co, faces, self.Loops(loopCount), self.Counted().tolist())
+        
+        self.ticks = []
+        while self.at < len(self.data):
+            flags, seconds, vertCount, movedCount, toggledCount = self.Unpack("<BdIII")
+            moved = self.Array("<u4", movedCount)
+            co = self.Array("<f4", movedCount*3).reshape(-1, 3)
+            toggled = self.Array("<u4", toggledCount)
+            loops = self.Loops(self.Unpack("<I")[0]) if flags & TRACE_LOOPS else None
+            self.ticks.append((flags, seconds, vertCount, moved, co, toggled, loops))
+    
+    def Unpack(self, fmt):
+        values = struct.unpack_from(fmt, self.data, self.at)
+        self.at += struct.calcsize(fmt)
+        return values
+    
+    def Array(self, dtype, count):
+        a = np.frombuffer(self.data, dtype=dtype, count=count, offset=self.at)
+        self.at += a.nbytes
+        return a
+    
+    def Counted(self):
+        return self.Array("<u4", self.Unpack("<I")[0])
+    
+    def Loops(self, count):
+        return [self.Counted().tolist() for k in range(count)]
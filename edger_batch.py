@@ -0,0 +1,119 @@
+"""Strips Edger loops from every object of many .blend files without the UI
+
+    python edger_batch.py --blender /path/to/blender --jobs 4 --out-dir stripped --report report.json a.blend b.blend
+
+Each file is opened by its own background Blender, jobs of them at a
+time. Every mesh object with _edger_ groups or a loop id layer gets its
+loops dissolved on mesh data in place, the way Clear Loops makes its copy,
+and the file is saved under the same name in out-dir (sources are never
+overwritten). Loops, dissolved edges and seconds of each object go to
+the report as JSON.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+def ClearFile(save, batched):
+    """Runs inside Blender on the open file, returns an entry per object"""
+    import bpy
+    from edger import ClearObjectLoops, StripObjectLoops, HasEdgerLoops
+    
+    objects = []
+    cleared = set()
+    for obj in bpy.data.objects:
+        if obj.type != 'MESH' or not HasEdgerLoops(obj):
+            continue
+        start = time.perf_counter()
+        #linked duplicates share one mesh, it is dissolved once and the rest only get stripped
+        shared = obj.data.name in cleared
+        if shared:
+            loops, edges = 0, 0
+            StripObjectLoops(obj, shared)
+        else:
+            loops, edges = ClearObjectLoops(obj, batched)
+            cleared.add(obj.data.name)
+        objects.append({"object": obj.name, "mesh": obj.data.name, "shared": shared, "loops": loops,
+                        "edges": edges, "seconds": time.perf_counter() -start})
+    bpy.ops.wm.save_as_mainfile(filepath = save, copy = True)
+    return objects
+
+def Worker(argv):
+    """Entry inside Blender, arguments come after --"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--save", required = True)
+    parser.add_argument("--result", required = True)
+    parser.add_argument("--no-batch", action = "store_true")
+    args = parser.parse_args(argv)
+    
+    objects = ClearFile(args.save, not args.no_batch)
+    with open(args.result, "w") as f:
+        json.dump(objects, f)
+
+def RunFile(blender, path, outDir, batched):
+    """One background Blender for path, returns its report entry"""
+    save = os.path.join(outDir, os.path.basename(path))
+    entry = {"file": path, "out": save, "objects": []}
+    fd, result = tempfile.mkstemp(suffix = ".json")
+    os.close(fd)
+    command = [blender, "--background", "--factory-startup", path, "--python", os.path.abspath(__file__),
+               "--", "--save", save, "--result", result] +([] if batched else ["--no-batch"])
+    start = time.perf_counter()
+    try:
+        process = subprocess.Popen(command, stdout = subprocess.PIPE, stderr = subprocess.STDOUT)
+        log = process.communicate()[0]
+        entry["returncode"] = process.returncode
+        entry["seconds"] = time.perf_counter() -start
+        try:
+            with open(result) as f:
+                entry["objects"] = json.load(f)
+        except (IOError, ValueError):
+            entry["error"] = log.decode("utf-8", "replace")[-2000:]
+    finally:
+        os.remove(result)
+    return entry
+
+def Run(blender, files, outDir, jobs, batched):
+    from edger_bench import EdgerVersion
+    if not os.path.isdir(outDir):
+        os.makedirs(outDir)
+    outs = set(os.path.abspath(os.path.join(outDir, os.path.basename(f))) for f in files)
+    if len(outs) < len(files) or any(os.path.abspath(f) in outs for f in files):
+        raise ValueError("files need distinct names outside out-dir")
+    
+    #each worker is a Blender process, threads only wait on them
+    with ThreadPoolExecutor(max_workers = jobs) as pool:
+        entries = list(pool.map(lambda f: RunFile(blender, f, outDir, batched), files))
+    for entry in entries:
+        if "error" in entry:
+            print("Edger: %s failed (%s)" %(entry["file"], entry["returncode"]))
+        for o in entry["objects"]:
+            print("%-32s %-24s %6d loops %8d edges %9.4fs" %(os.path.basename(entry["file"]), o["object"], o["loops"], o["edges"], o["seconds"]))
+    return {"edger": EdgerVersion(), "time": time.strftime("%Y-%m-%dT%H:%M:%S"), "jobs": jobs, "batched": batched, "files": entries}
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = "Dissolve Edger loops of every object in .blend files with background Blenders")
+    parser.add_argument("files", nargs = "+", help = ".blend files to strip")
+    parser.add_argument("--blender", default = "blender", help = "Blender executable")
+    parser.add_argument("--out-dir", required = True, help = "stripped files are saved here under their own names")
+    parser.add_argument("--jobs", type = int, default = os.cpu_count() or 1, help = "Blenders running at once")
+    parser.add_argument("--report", help = "write per object loops, edges and seconds as JSON here")
+    parser.add_argument("--no-batch", action = "store_true", help = "find loops with the bmesh walker instead of index arrays")
+    args = parser.parse_args(argv)
+    
+    run = Run(args.blender, args.files, args.out_dir, max(1, args.jobs), not args.no_batch)
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(run, f, indent = 1)
+    return run
+
+if __name__ == "__main__":
+    #Blender runs this with its own arguments first, ours follow --
+    if "bpy" in sys.modules:
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        Worker(sys.argv[sys.argv.index("--") +1:])
+    else: main()
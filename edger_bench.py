@@ -0,0 +1,203 @@
+"""Times Edger stages on synthetic meshes, runs without Blender
+
+    python edger_bench.py --sizes 10000,100000 --out results.json
+    python edger_bench.py --compare results.json
+
+Each mesh gets its support loops as groups, then refine (bmesh like walk
+and index arrays), auto lock detection, sort, adjInfos, a whole ReInit
+and lock ticks (batched, idle and one by one) with interpolation of one
+layer over every record are timed.
+Results are written as JSON so runs of different versions can be compared.
+"""
+import argparse
+import ast
+import json
+import math
+import os
+import platform
+import sys
+import time
+
+#core on its own, importing the edger package needs bpy
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "edger"))
+from core import MemMesh, FindAllCyclicLoops, SortGroupVertsByAdjacent, GetAdjInfos, \
+     InitLoops, BuildRecordTable, BuildLockSolver, LockVertsOnEdge, DataLerp, np
+
+def Grid(nx, ny, loops = 0):
+    """Flat nx*ny grid, every loop column is open so refine rejects it"""
+    mesh = MemMesh()
+    rows = [[mesh.AddVert((x, y, 0.0)) for x in range(nx)] for y in range(ny)]
+    for y in range(ny -1):
+        for x in range(nx -1):
+            mesh.AddFace((rows[y][x], rows[y][x +1], rows[y +1][x +1], rows[y +1][x]))
+    
+    groupVerts = {}
+    for k, x in enumerate(Spread(loops, 1, nx -2)):
+        groupVerts["_edger_." +str(k)] = [rows[y][x] for y in range(ny)]
+    return mesh, groupVerts
+
+def Cylinder(segments, rings, loops = 0):
+    """Open cylinder, loops rings in between are inserted support loops"""
+    mesh = MemMesh()
+    circle = [(math.cos(2*math.pi*s/segments), math.sin(2*math.pi*s/segments)) for s in range(segments)]
+    ringVerts = [[mesh.AddVert((x, y, float(r))) for x, y in circle] for r in range(rings)]
+    for r in range(rings -1):
+        a, b = ringVerts[r], ringVerts[r +1]
+        for s in range(segments):
+            t = (s +1) %segments
+            mesh.AddFace((a[s], a[t], b[t], b[s]))
+    
+    groupVerts = {}
+    for k, r in enumerate(Spread(loops, 1, rings -2)):
+        groupVerts["_edger_." +str(k)] = list(ringVerts[r])
+    return mesh, groupVerts
+
+def Torus(nu, nv, loops = 0, R = 2.0, r = 0.5, flipped = None):
+    """Closed nu*nv torus, loops are rings around the tube
+    
+    Ring i is vertices i*nv to (i +1)*nv. Faces where flipped(i, j) is
+    true are wound the other way, like meshes with inconsistent normals.
+    """
+    mesh = MemMesh()
+    rings = []
+    for i in range(nu):
+        a = 2*math.pi*i/nu
+        ring = []
+        for j in range(nv):
+            b = 2*math.pi*j/nv
+            ring.append(mesh.AddVert(((R +r*math.cos(b))*math.cos(a), (R +r*math.cos(b))*math.sin(a), r*math.sin(b))))
+        rings.append(ring)
+    for i in range(nu):
+        a, b = rings[i], rings[(i +1) %nu]
+        for j in range(nv):
+            t = (j +1) %nv
+            face = (a[j], b[j], b[t], a[t])
+            mesh.AddFace(face[::-1] if flipped is not None and flipped(i, j) else face)
+    
+    groupVerts = {}
+    for k, i in enumerate(Spread(loops, 0, nu -1)):
+        groupVerts["_edger_." +str(k)] = list(rings[i])
+    return mesh, groupVerts
+
+def Spread(count, first, last):
+    """count distinct indices spread evenly over first..last"""
+    count = min(count, last -first +1)
+    if count <= 0:
+        return []
+    step = (last -first +1)/float(count)
+    return sorted(set(first +int(k*step) for k in range(count)))
+
+def Meshes(sizes, loops):
+    """(name, mesh, groupVerts) for every generator at each vertex count"""
+    for size in sizes:
+        side = max(4, int(round(math.sqrt(size))))
+        label = "%dk" %(size //1000) if size >= 1000 else str(size)
+        yield ("grid-" +label,) +Grid(side, side, loops)
+        yield ("cylinder-" +label,) +Cylinder(side, side, loops)
+        yield ("torus-" +label,) +Torus(side, side, loops)
+
+def Timed(func, repeat, setup = None):
+    """Seconds of each of repeat runs, setup() result is passed to func outside the timing"""
+    times = []
+    for r in range(repeat):
+        arg = setup() if setup else None
+        start = time.perf_counter()
+        if setup:
+            func(arg)
+        else: func()
+        times.append(time.perf_counter() -start)
+    return times
+
+def MoveEnds(adjInfos, offset):
+    for v in set(i.end1 for i in adjInfos) | set(i.end2 for i in adjInfos):
+        co = v.co
+        v.co = (co[0] +offset, co[1], co[2])
+
+def BenchMesh(name, mesh, groupVerts, repeat):
+    results = []
+    def Add(stage, times, **counts):
+        entry = {"mesh": name, "stage": stage, "verts": len(mesh.verts), "faces": len(mesh.faces),
+                 "groups": len(groupVerts), "min": min(times), "median": sorted(times)[len(times) //2],
+                 "repeat": len(times)}
+        entry.update(counts)
+        results.append(entry)
+    
+    Add("refine", Timed(lambda: FindAllCyclicLoops(groupVerts), repeat))
+    if np is not None:
+        #arrays come from foreach_get in Blender, building them from MemMesh is left out of the timing
+        topology = mesh.Topology()
+        Add("refine-csr", Timed(lambda: topology.FindAllCyclicLoops(groupVerts, mesh.verts), repeat))
+        Add("autolock", Timed(topology.LockableLoops, repeat), loops=len(topology.LockableLoops()))
+    loops, remainders, adjInfos = InitLoops(groupVerts)
+    
+    unordered = dict((k, sorted(loops[k], key = lambda v: v.index)) for k in loops)
+    Add("sort", Timed(SortGroupVertsByAdjacent, repeat, lambda: dict((k, list(unordered[k])) for k in unordered)), loops=len(loops))
+    Add("adjinfos", Timed(lambda: GetAdjInfos(loops, remainders), repeat), records=len(adjInfos))
+    Add("reinit", Timed(lambda: BuildLockSolver(BuildRecordTable(mesh, InitLoops(groupVerts)[2]), mesh.verts), repeat), records=len(adjInfos))
+    
+    Add("lock-object", Timed(LockVertsOnEdge, repeat, lambda: MoveEnds(adjInfos, 0.01) or adjInfos), records=len(adjInfos))
+    solver = BuildLockSolver(BuildRecordTable(mesh, adjInfos), mesh.verts)
+    if solver is not None:
+        solver.Solve(mesh.verts)
+        Add("lock-batched", Timed(lambda s: s.Solve(mesh.verts), repeat, lambda: MoveEnds(adjInfos, 0.01) or solver), records=len(adjInfos))
+        Add("lock-idle", Timed(lambda: solver.Solve(mesh.verts), repeat), records=len(adjInfos))
+        
+        #two floats per vertex kept in a dict stand in for a bmesh layer
+        layer = dict((v, (v.co[0], v.co[1])) for v in mesh.verts)
+        lerp = DataLerp(adjInfos)
+        lerp.AddChannel("layer", range(len(adjInfos)), [i.target for i in adjInfos], [i.end1 for i in adjInfos], [i.end2 for i in adjInfos],
+                        lambda verts: np.array([layer[v] for v in verts], dtype=np.float64).reshape(len(verts), 2),
+                        lambda verts, values: layer.update(zip(verts, map(tuple, values.tolist()))))
+        Add("lerp-batched", Timed(lerp.Apply, repeat, lambda: solver.AllLevels()), records=len(adjInfos))
+    return results
+
+def EdgerVersion():
+    """bl_info version read from the addon without importing bpy"""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "edger", "__init__.py")
+    try:
+        tree = ast.parse(open(path).read())
+    except (IOError, SyntaxError):
+        return None
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and getattr(node.targets[0], "id", None) == "bl_info":
+            return list(ast.literal_eval(node.value)["version"])
+    return None
+
+def Run(sizes, loops, repeat):
+    results = []
+    for name, mesh, groupVerts in Meshes(sizes, loops):
+        for entry in BenchMesh(name, mesh, groupVerts, repeat):
+            print("%-16s %-13s %10.4fs" %(entry["mesh"], entry["stage"], entry["median"]))
+            results.append(entry)
+    return {"edger": EdgerVersion(), "python": platform.python_version(),
+            "numpy": np.__version__ if np is not None else None, "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"), "results": results}
+
+def Compare(base, run):
+    """Prints median speedup of run over base for each mesh and stage both have"""
+    old = dict(((e["mesh"], e["stage"]), e["median"]) for e in base["results"])
+    for e in run["results"]:
+        key = (e["mesh"], e["stage"])
+        if key in old and e["median"] > 0:
+            print("%-16s %-13s %10.4fs -> %10.4fs  x%.2f" %(key +(old[key], e["median"], old[key]/e["median"])))
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = "Benchmark Edger stages on synthetic meshes")
+    parser.add_argument("--sizes", default = "10000,100000", help = "comma separated vertex counts per mesh")
+    parser.add_argument("--loops", type = int, default = 16, help = "support loops per mesh")
+    parser.add_argument("--repeat", type = int, default = 3)
+    parser.add_argument("--out", help = "write results as JSON here")
+    parser.add_argument("--compare", help = "JSON of an earlier run to compare against")
+    args = parser.parse_args(argv)
+    
+    run = Run([int(s) for s in args.sizes.split(",") if s], args.loops, args.repeat)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(run, f, indent = 1)
+    if args.compare:
+        with open(args.compare) as f:
+            Compare(json.load(f), run)
+    return run
+
+if __name__ == "__main__":
+    main()
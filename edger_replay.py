@@ -0,0 +1,185 @@
+"""Replays an edit session trace recorded in Edger and times every tick, runs without Blender
+
+    python edger_replay.py session.edgertrace --out replay.json
+    python edger_replay.py session.edgertrace --compare replay.json
+
+The mesh the trace starts from is rebuilt as a MemMesh. Each tick then
+applies the recorded moves and selection flips and runs what the pass ran:
+a rebuild where ReInit ran, adding or removing records of loops locked
+or unlocked in between, deselecting
+when selection changed and locking. Per tick latency percentiles of each
+stage and of the recorded passes are printed and written as JSON so
+runs of different versions can be compared. Replay stops at the first
+topology edit, the trace doesn't hold the new mesh.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+#core on its own, importing the edger package needs bpy
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "edger"))
+from core import MemMesh, TraceReader, FindAllCyclicLoops, SortGroupVertsByAdjacent, GetAdjInfos, \
+     BuildRecordTable, BuildLockSolver, OrderRecords, LockVertsOnEdge, SettleVertsOnEdge, IndexTargetRecords, DeselectTargets, SelectEnds, Percentile, TRACE_REINIT, TRACE_TOPOLOGY, TRACE_LOOPS, np
+from edger_bench import EdgerVersion
+
+def BuildMesh(mesh):
+    co, faces, loops, selected = mesh
+    m = MemMesh()
+    verts = [m.AddVert(c) for c in co.tolist()]
+    for f in faces:
+        m.AddFace([verts[i] for i in f])
+    for i in selected:
+        verts[i].select = True
+    return m
+
+class Session(object):
+    """Lock state of a replayed mesh, what ReInit keeps in the addon's globals
+    
+    Loops are keyed by their vertex indices so loops added or removed
+    between ticks are matched and handled like LockLoops and
+    RemoveLockedLoop do, without touching records of the others.
+    """
+    def __init__(self, mesh, batched):
+        self.mesh = mesh
+        self.batched = batched
+    
+    def Rebuild(self, loops):
+        """Everything from scratch like ReInit"""
+        verts = self.mesh.verts
+        found = FindAllCyclicLoops(dict((k, [verts[i] for i in loop]) for k, loop in enumerate(loops)))
+        self.adjInfos = self.Records([frozenset(v.index for v in loop) for loop in found])
+        self.loops = set(i.loop for i in self.adjInfos)
+        self.Index()
+        self.solver = BuildLockSolver(self.table, verts) if self.batched else None
+    
+    def Edit(self, loops):
+        """Locks loops that are new and unlocks the ones gone"""
+        keys = set(frozenset(loop) for loop in loops)
+        for key in self.loops -keys:
+            self.adjInfos = [i for i in self.adjInfos if i.loop != key]
+            if self.solver is not None:
+                self.solver.RemoveLoop(key)
+        records = self.Records(keys -self.loops)
+        self.adjInfos += records
+        self.loops = keys
+        self.Index()
+        if self.solver is not None and len(records) > 0:
+            self.solver.AddRecords(self.table, self.mesh.verts, len(self.adjInfos) -len(records))
+    
+    def Records(self, keys):
+        verts = self.mesh.verts
+        groups = dict((key, [verts[i] for i in sorted(key)]) for key in keys)
+        return GetAdjInfos(groups, SortGroupVertsByAdjacent(groups))
+    
+    def Index(self):
+        self.order, self.cyclic = OrderRecords(self.adjInfos)
+        self.table = BuildRecordTable(self.mesh, self.adjInfos)
+        self.targetRecords = IndexTargetRecords({}, self.table)
+    
+    def Deselect(self):
+        verts = self.mesh.verts
+        SelectEnds(verts, DeselectTargets(verts, self.targetRecords))
+    
+    def Lock(self):
+        if self.solver is not None:
+            self.solver.Solve(self.mesh.verts)
+        else:
+            LockVertsOnEdge(self.order)
+            if self.cyclic > 0:
+                SettleVertsOnEdge(self.order[len(self.order) -self.cyclic:])
+
+def Replay(trace, batched):
+    """Seconds per tick of each stage, and how many ticks got replayed"""
+    mesh = BuildMesh(trace.mesh)
+    verts = mesh.verts
+    session = Session(mesh, batched)
+    session.Rebuild(trace.mesh[2])
+    if session.solver is not None:
+        session.solver.Solve(verts)
+    
+    stages = {"rebuild": [], "deselect": [], "lock": [], "tick": []}
+    ticks = 0
+    for flags, seconds, vertCount, moved, co, toggled, loops in trace.ticks:
+        if flags & TRACE_TOPOLOGY or vertCount != len(verts):
+            break
+        #recorded input, not part of the pass
+        for i, c in zip(moved.tolist(), co.tolist()):
+            verts[i].co = tuple(c)
+        for i in toggled.tolist():
+            verts[i].select = not verts[i].select
+    
+        start = time.perf_counter()
+        if flags & TRACE_REINIT:
+            session.Rebuild(loops)
+            stages["rebuild"].append(time.perf_counter() -start)
+        elif flags & TRACE_LOOPS:
+            session.Edit(loops)
+            stages["rebuild"].append(time.perf_counter() -start)
+        mark = time.perf_counter()
+        if len(toggled) > 0 or flags & (TRACE_REINIT | TRACE_LOOPS):
+            session.Deselect()
+            stages["deselect"].append(time.perf_counter() -mark)
+        mark = time.perf_counter()
+        session.Lock()
+        end = time.perf_counter()
+        stages["lock"].append(end -mark)
+        stages["tick"].append(end -start)
+        ticks += 1
+    return stages, ticks
+
+def Distribution(seconds):
+    ordered = sorted(seconds)
+    count = len(ordered)
+    return {"count": count, "mean": sum(ordered)*1000/count if count else 0.0,
+            "p50": Percentile(ordered, 0.5)*1000, "p95": Percentile(ordered, 0.95)*1000,
+            "p99": Percentile(ordered, 0.99)*1000, "max": ordered[-1]*1000 if count else 0.0}
+
+def Run(path, batched, repeat):
+    trace = TraceReader(path)
+    runs = [Replay(trace, batched) for r in range(repeat)]
+    ticks = runs[0][1]
+    #replays are deterministic, the fastest run of each tick is the least noisy
+    stages = {}
+    for stage in runs[0][0]:
+        stages[stage] = Distribution([min(times) for times in zip(*[run[0][stage] for run in runs])])
+    stages["recorded"] = Distribution([t[1] for t in trace.ticks[:ticks]])
+    for stage in ("tick", "rebuild", "deselect", "lock", "recorded"):
+        d = stages[stage]
+        print("%-10s %6d x  mean %8.3f  p50 %8.3f  p95 %8.3f  p99 %8.3f  max %8.3f ms" %(stage, d["count"], d["mean"], d["p50"], d["p95"], d["p99"], d["max"]))
+    if ticks < len(trace.ticks):
+        print("Edger: replay stopped at tick " +str(ticks) +" of " +str(len(trace.ticks)) +", topology changed there")
+    return {"edger": EdgerVersion(), "trace": path, "verts": len(trace.mesh[0]), "ticks": ticks,
+            "batched": batched, "repeat": repeat, "time": time.strftime("%Y-%m-%dT%H:%M:%S"), "stages": stages}
+
+def Compare(base, run):
+    """Prints p50 and p95 of run against base for each stage both have"""
+    for stage, d in run["stages"].items():
+        old = base["stages"].get(stage)
+        if old is None or stage == "recorded":
+            continue
+        for key in ("p50", "p95"):
+            if d[key] > 0:
+                print("%-10s %s %8.3f -> %8.3f ms  x%.2f" %(stage, key, old[key], d[key], old[key]/d[key]))
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = "Replay an Edger trace and time every tick")
+    parser.add_argument("trace", help = ".edgertrace recorded with Record Trace")
+    parser.add_argument("--repeat", type = int, default = 3, help = "replays, each tick keeps its fastest")
+    parser.add_argument("--no-batch", action = "store_true", help = "lock one record at a time")
+    parser.add_argument("--out", help = "write results as JSON here")
+    parser.add_argument("--compare", help = "JSON of an earlier replay to compare against")
+    args = parser.parse_args(argv)
+    
+    run = Run(args.trace, not args.no_batch and np is not None, max(1, args.repeat))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(run, f, indent = 1)
+    if args.compare:
+        with open(args.compare) as f:
+            Compare(json.load(f), run)
+    return run
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+"""Checks of the Edger core on MemMesh, run without Blender from the repository root
+
+    python -m unittest discover -s tests -t .
+"""
+import os
+import sys
+
+#core on its own, importing the edger package needs bpy
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "edger"))
@@ -0,0 +1,37 @@
+"""Meshes and reference results the checks share"""
+from core import walk_edgeloop_loops
+from edger_bench import Torus as BenchTorus
+
+#faces wound the other way, none, every other, one strip and scattered
+flips = [("none", lambda i, j: False), ("checker", lambda i, j: (i +j) %2 == 0),
+         ("strip", lambda i, j: i == 2), ("random", lambda i, j: (i*7 +j*3) %5 < 2)]
+
+def Torus(nu, nv, flipped = None):
+    """Torus of edger_bench, returns (mesh, tube rings, rings around)"""
+    mesh = BenchTorus(nu, nv, flipped = flipped)[0]
+    rings = [list(mesh.verts[i*nv:(i +1)*nv]) for i in range(nu)]
+    return mesh, rings, [[rings[i][j] for i in range(nu)] for j in range(nv)]
+
+def Groups(mesh, rings, around):
+    """Whole mesh, crossing rings with a stray column, a ring and a column, a piece of a ring"""
+    return [list(mesh.verts), rings[1] +rings[2] +around[3][:5], around[2] +rings[4], rings[0][:3]]
+
+def BruteCyclicLoops(verts):
+    """FindCyclicLoops walking from every loop of every vertex, nothing pruned"""
+    inGroup = set(verts)
+    cyclics = set()
+    for v in verts:
+        for l in v.link_loops:
+            edges = []
+            for wl in walk_edgeloop_loops(l):
+                a, b = wl.edge.verts
+                if a not in inGroup or b not in inGroup or len(a.link_edges) == 3 or len(b.link_edges) == 3:
+                    edges = []
+                    break
+                edges.append(wl.edge)
+            if len(edges) > 2 and (edges[0].verts[0] in edges[-1].verts or edges[0].verts[1] in edges[-1].verts):
+                cyclics.add(frozenset(v.index for e in edges for v in e.verts))
+    return cyclics
+
+def Indices(loops):
+    return set(frozenset(v.index for v in loop) for loop in loops)
@@ -0,0 +1,76 @@
+"""Checks of the core on MemMesh
+
+Loops get ordered with their remainders and record tables notice replaced
+vertices.
+"""
+import random
+import unittest
+
+from core import MemVert, OrderLoopVerts, \
+     SortGroupVertsByAdjacent, InitLoops, BuildRecordTable, \
+     IndexTargetRecords, DeselectTargets, SelectEnds
+from edger_bench import Cylinder
+from tests.meshes import Torus, Indices
+
+class TestOrder(unittest.TestCase):
+    def testOrderedAlongLoop(self):
+        mesh, rings, around = Torus(8, 6)
+        shuffled = list(rings[3])
+        random.Random(1).shuffle(shuffled)
+        ordered, rest = OrderLoopVerts(shuffled)
+        self.assertEqual(rest, [])
+        self.assertEqual(set(ordered), set(rings[3]))
+        for a, b in zip(ordered, ordered[1:] +ordered[:1]):
+            self.assertIn(b, [e.other_vert(a) for e in a.link_edges])
+
+    def testRemainders(self):
+        mesh, rings, around = Torus(8, 6)
+        groupVerts = {"_edger_.0": list(rings[3]) +[rings[6][0]]}
+        remainders = SortGroupVertsByAdjacent(groupVerts)
+        self.assertEqual(remainders, {"_edger_.0": [rings[6][0]]})
+        self.assertEqual(set(groupVerts["_edger_.0"]), set(rings[3]))
+
+    def testInitLoops(self):
+        mesh, groupVerts = Cylinder(12, 8, 3)
+        loops, remainders, adjInfos = InitLoops(groupVerts)
+        self.assertEqual(Indices(loops.values()), Indices(groupVerts.values()))
+        self.assertEqual(remainders, {})
+        self.assertEqual(len(adjInfos), 3*12)
+
+class TestRecordTable(unittest.TestCase):
+    def testIsValid(self):
+        mesh, groupVerts = Cylinder(12, 8, 3)
+        table = BuildRecordTable(mesh, InitLoops(groupVerts)[2])
+        verts = list(mesh.verts)
+        self.assertTrue(table.IsValid(verts))
+        #a vertex freed and another made in its place keeps the count
+        t = table.targets[0]
+        verts[t] = MemVert(verts[t].co, t)
+        self.assertTrue(table.IsValid(verts, full=False))
+        self.assertFalse(table.IsValid(verts))
+        self.assertFalse(table.IsValid(verts[:-1], full=False))
+
+    def testDeselectSelectsNearerEnd(self):
+        mesh, groupVerts = Cylinder(12, 8, 3)
+        table = BuildRecordTable(mesh, InitLoops(groupVerts)[2])
+        verts = mesh.verts
+        t, end1, end2, ratio = table.targets[0], table.ends1[0], table.ends2[0], table.ratios[0]
+        verts[t].select = True
+        SelectEnds(verts, DeselectTargets(verts, IndexTargetRecords({}, table)))
+        self.assertFalse(verts[t].select)
+        self.assertTrue(verts[end1 if ratio < 0.5 else end2].select)
+
+    def testDeselectOnlyCandidates(self):
+        mesh, groupVerts = Cylinder(12, 8, 3)
+        table = BuildRecordTable(mesh, InitLoops(groupVerts)[2])
+        targetRecords = IndexTargetRecords({}, table)
+        verts = mesh.verts
+        first, second = sorted(targetRecords)[:2]
+        verts[first].select = verts[second].select = True
+        #not a target, skipped
+        other = next(v.index for v in verts if v.index not in targetRecords)
+        self.assertEqual(len(DeselectTargets(verts, targetRecords, [other, second])), len(targetRecords[second]))
+        self.assertEqual((verts[first].select, verts[second].select), (True, False))
+
+if __name__ == "__main__":
+    unittest.main()
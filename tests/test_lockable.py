@@ -0,0 +1,41 @@
+"""Auto lock on MemMesh and on index arrays finds the same loops"""
+import unittest
+
+from core import FindLockableLoops, np
+from edger_bench import Cylinder
+from tests.meshes import Torus, flips
+
+@unittest.skipIf(np is None, "needs numpy")
+class TestLockable(unittest.TestCase):
+    def Both(self, mesh, tolerance = 1e-4, margin = 0.0):
+        found = [sorted(v.index for v in loop) for loop in FindLockableLoops(mesh.verts, tolerance, margin)]
+        arrays = [loop.tolist() for loop in mesh.Topology().LockableLoops(tolerance, margin)]
+        self.assertEqual(arrays, found)
+        return found
+
+    def testCylinder(self):
+        mesh, groupVerts = Cylinder(12, 8)
+        #boundary rings have valence 3, the rest sit between the rings next to them
+        self.assertEqual(len(self.Both(mesh)), 6)
+
+    def testOffLine(self):
+        mesh, groupVerts = Cylinder(12, 8)
+        v = mesh.verts[3*12 +5]
+        v.co = (v.co[0]*1.01, v.co[1]*1.01, v.co[2])
+        #its ring and the ones it is an end of
+        self.assertEqual(len(self.Both(mesh)), 3)
+        self.assertEqual(len(self.Both(mesh, tolerance = 0.1)), 6)
+
+    def testMargin(self):
+        mesh, groupVerts = Cylinder(12, 8)
+        v = mesh.verts[3*12 +5]
+        v.co = (v.co[0], v.co[1], v.co[2] -0.45)
+        self.assertEqual(len(self.Both(mesh, margin = 0.3)), 5)
+        self.assertEqual(len(self.Both(mesh, margin = 0.2)), 6)
+
+    def testTorus(self):
+        mesh, rings, around = Torus(12, 8, flips[1][1])
+        self.Both(mesh, tolerance = 0.2)
+
+if __name__ == "__main__":
+    unittest.main()
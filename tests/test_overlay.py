@@ -0,0 +1,33 @@
+"""LoopBounds culls loops out of view and decimates small ones"""
+import math
+import unittest
+
+from core import MemVert, LoopBounds, np
+
+def Ring(center, radius, count):
+    """count MemVerts on a circle in the xy plane"""
+    return [MemVert((center[0] +radius*math.cos(2*math.pi*k/count), center[1] +radius*math.sin(2*math.pi*k/count), center[2]), k)
+            for k in range(count)]
+
+def Perspective(near = 0.1, far = 100.0):
+    """90 degree square view from the origin down -z, like a region's perspective_matrix"""
+    return [[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, (far +near)/(near -far), 2*far*near/(near -far)], [0, 0, -1, 0]]
+
+@unittest.skipIf(np is None, "needs numpy")
+class TestLoopBounds(unittest.TestCase):
+    def testStrides(self):
+        loops = [Ring((0, 0, -5), 1.0, 64),      #in view, decimated
+                 Ring((0, 0, -2), 1.0, 16),      #near, every vertex
+                 Ring((100, 0, -5), 1.0, 16),    #off to the side
+                 Ring((0, 0, 5), 1.0, 16),       #behind
+                 Ring((0, 0, -50), 1e-3, 16),    #under a pixel
+                 Ring((0, 0, 0), 1.0, 16)]       #around the eye
+        bounds = LoopBounds(loops)
+        self.assertEqual(bounds.Strides(Perspective(), 100, 100).tolist(), [3, 1, 0, 0, -1, 1])
+        self.assertEqual(len(bounds.Loop(0, 3)), 22)
+
+    def testNoLoops(self):
+        self.assertEqual(len(LoopBounds([]).Strides(Perspective(), 100, 100)), 0)
+
+if __name__ == "__main__":
+    unittest.main()
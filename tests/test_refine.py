@@ -0,0 +1,21 @@
+"""Rings the walker finds in groups, against a brute force walk where faces are wound either way"""
+import unittest
+
+from core import FindCyclicLoops
+from tests.meshes import Torus, Groups, BruteCyclicLoops, Indices, flips
+
+class TestRings(unittest.TestCase):
+    def testPlainTorusRings(self):
+        mesh, rings, around = Torus(8, 6)
+        for group in Groups(mesh, rings, around):
+            inGroup = set(group)
+            self.assertEqual(Indices(FindCyclicLoops(group)), Indices(r for r in rings +around if inGroup.issuperset(r)))
+
+    def testFlippedTorusRings(self):
+        for name, flipped in flips:
+            mesh, rings, around = Torus(8, 6, flipped)
+            for group in Groups(mesh, rings, around):
+                self.assertEqual(Indices(FindCyclicLoops(group)), BruteCyclicLoops(group), name)
+
+if __name__ == "__main__":
+    unittest.main()
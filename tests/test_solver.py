@@ -0,0 +1,101 @@
+"""Batched locking against the per vertex path, levels, cycles and incremental edits of LockSolver"""
+import random
+import unittest
+
+from core import SortGroupVertsByAdjacent, GetAdjInfos, InitLoops, OrderRecords, LockVertsOnEdge, BuildRecordTable, BuildLockSolver, np
+from edger_bench import Cylinder
+from tests.meshes import Torus
+
+@unittest.skipIf(np is None, "needs numpy")
+class TestSolver(unittest.TestCase):
+    def Moved(self, mesh, adjInfos, seed):
+        """Moves every vertex locking reads but does not write"""
+        targets = set(i.target for i in adjInfos)
+        rng = random.Random(seed)
+        for v in sorted(set(i.end1 for i in adjInfos) | set(i.end2 for i in adjInfos), key = lambda v: v.index):
+            if v not in targets:
+                v.co = (v.co[0] +rng.uniform(-0.1, 0.1), v.co[1] +rng.uniform(-0.1, 0.1), v.co[2] +rng.uniform(-0.1, 0.1))
+        return mesh.Coords()
+
+    def Locked(self, build, path):
+        mesh, groupVerts = build()
+        loops, remainders, adjInfos = InitLoops(groupVerts)
+        self.Moved(mesh, adjInfos, 5)
+        solver = BuildLockSolver(BuildRecordTable(mesh, adjInfos), mesh.verts)
+        if path == "object":
+            ordered, cyclic = OrderRecords(adjInfos)
+            self.assertEqual(cyclic, 0)
+            LockVertsOnEdge(ordered)
+        else: solver.Solve(mesh.verts, adjInfos if path == "vertex" else None)
+        return mesh.Coords(), solver
+
+    def testLevelsMatchObjectPath(self):
+        #the crossing vertex reads targets of both loops, it is locked a level later
+        def Build():
+            mesh, rings, around = Torus(12, 8)
+            return mesh, {"_edger_.0": rings[4], "_edger_.1": around[0]}
+        objectPath = self.Locked(Build, "object")[0]
+        batched, solver = self.Locked(Build, "batched")
+        self.assertEqual((len(solver.levels), solver.cyclic), (2, 0))
+        self.assertTrue(np.allclose(batched, objectPath, atol=1e-6))
+        self.assertTrue(np.allclose(self.Locked(Build, "vertex")[0], objectPath, atol=1e-6))
+
+    def testCyclesMatchPerVertexPath(self):
+        #neighbouring rings lock each other
+        def Build():
+            mesh, rings, around = Torus(12, 8)
+            return mesh, {"_edger_.0": rings[2], "_edger_.1": rings[3], "_edger_.2": around[5]}
+        batched, solver = self.Locked(Build, "batched")
+        self.assertGreater(solver.cyclic, 0)
+        self.assertTrue(np.allclose(batched, self.Locked(Build, "vertex")[0], atol=1e-5))
+
+    def testIdleTick(self):
+        mesh, groupVerts = Cylinder(12, 8, 3)
+        loops, remainders, adjInfos = InitLoops(groupVerts)
+        solver = BuildLockSolver(BuildRecordTable(mesh, adjInfos), mesh.verts)
+        self.assertEqual(solver.Solve(mesh.verts), len(adjInfos))
+        self.assertEqual(solver.Solve(mesh.verts), 0)
+
+    def Same(self, solver, fresh):
+        """Records, levels and end uses of solver are what a fresh build has, ends compared by vertex as slots may differ"""
+        self.assertEqual(solver.targets, fresh.targets)
+        ends, freshEnds = np.array(solver.ends), np.array(fresh.ends)
+        self.assertTrue((ends[solver.end1] == freshEnds[fresh.end1]).all())
+        self.assertTrue((ends[solver.end2] == freshEnds[fresh.end2]).all())
+        self.assertTrue((solver.ratios == fresh.ratios).all())
+        self.assertEqual([sorted(l.tolist()) for l in solver.levels], [sorted(l.tolist()) for l in fresh.levels])
+        self.assertEqual(solver.cyclic, fresh.cyclic)
+        if fresh.cycles is not None:
+            self.assertEqual(sorted(solver.cycles.records.tolist()), sorted(fresh.cycles.records.tolist()))
+        uses = np.bincount(np.concatenate((solver.end1, solver.end2)), minlength=len(solver.ends))
+        self.assertTrue((solver.endUses == uses).all())
+
+    def testAddRemoveMatchFreshBuild(self):
+        #neighbouring rings lock each other, columns cross them
+        mesh, rings, around = Torus(16, 12)
+        pool = dict(("_edger_.r" +str(k), rings[k]) for k in range(len(rings)))
+        pool.update(("_edger_.a" +str(k), around[k]) for k in range(0, len(around), 3))
+        rng = random.Random(3)
+        solver = BuildLockSolver(BuildRecordTable(mesh, []), mesh.verts)
+        locked, adjInfos, compacted = [], [], False
+        for step in range(160):
+            if len(locked) > 0 and (rng.random() < 0.45 or len(locked) == len(pool)):
+                key = rng.choice(locked)
+                first, count = solver.FirstRecord(key)
+                del adjInfos[first:first +count]
+                endCount = len(solver.ends)
+                solver.RemoveLoop(key)
+                compacted = compacted or len(solver.ends) < endCount
+                locked.remove(key)
+            else:
+                key = rng.choice(sorted(set(pool) -set(locked)))
+                group = {key: list(pool[key])}
+                records = GetAdjInfos(group, SortGroupVertsByAdjacent(group))
+                adjInfos += records
+                solver.AddRecords(BuildRecordTable(mesh, adjInfos), mesh.verts, len(adjInfos) -len(records))
+                locked.append(key)
+            self.Same(solver, BuildLockSolver(BuildRecordTable(mesh, adjInfos), mesh.verts))
+        self.assertTrue(compacted)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,25 @@
+"""Rings MeshTopology finds on index arrays, against a brute force walk where faces are wound either way"""
+import unittest
+
+from core import np
+from tests.meshes import Torus, Groups, BruteCyclicLoops, flips
+
+@unittest.skipIf(np is None, "needs numpy")
+class TestTopology(unittest.TestCase):
+    def testFlippedTorusRings(self):
+        for name, flipped in flips:
+            mesh, rings, around = Torus(8, 6, flipped)
+            topology = mesh.Topology()
+            for group in Groups(mesh, rings, around):
+                self.assertEqual(topology.FindCyclicLoops([[v.index for v in group]]), BruteCyclicLoops(group), name)
+
+    def testSeveralGroups(self):
+        mesh, rings, around = Torus(8, 6, flips[2][1])
+        groups = Groups(mesh, rings, around)
+        brute = set()
+        for group in groups:
+            brute |= BruteCyclicLoops(group)
+        self.assertEqual(mesh.Topology().FindCyclicLoops([[v.index for v in group] for group in groups]), brute)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+"""Edit session traces read back what was written"""
+import os
+import tempfile
+import unittest
+
+from core import TraceWriter, TraceReader, TRACE_REINIT, TRACE_LOOPS, np
+from tests.meshes import Torus
+
+@unittest.skipIf(np is None, "needs numpy")
+class TestTrace(unittest.TestCase):
+    def testRoundTrip(self):
+        mesh, rings, around = Torus(6, 4)
+        co = mesh.Coords()
+        faces = [[v.index for v in f.verts] for f in mesh.faces]
+        loops = [[v.index for v in rings[1]], [v.index for v in around[2]]]
+        fd, path = tempfile.mkstemp(suffix = ".edgertrace")
+        os.close(fd)
+        try:
+            trace = TraceWriter(path, co, faces, loops, [0, 5])
+            trace.Tick(0, 0.25, len(co), [3, 4], co[[3, 4]] +1, [7])
+            trace.Tick(TRACE_REINIT | TRACE_LOOPS, 0.5, len(co), [], np.zeros((0, 3)), [], loops[:1])
+            trace.Close()
+            reader = TraceReader(path)
+        finally:
+            os.remove(path)
+
+        readCo, readFaces, readLoops, selected = reader.mesh
+        self.assertTrue(np.array_equal(readCo, co.astype(np.float32)))
+        self.assertEqual((readFaces, readLoops, selected), (faces, loops, [0, 5]))
+        self.assertEqual(len(reader.ticks), 2)
+        flags, seconds, vertCount, moved, movedCo, toggled, tickLoops = reader.ticks[0]
+        self.assertEqual((flags, seconds, vertCount, moved.tolist(), toggled.tolist(), tickLoops), (0, 0.25, len(co), [3, 4], [7], None))
+        self.assertTrue(np.array_equal(movedCo, (co[[3, 4]] +1).astype(np.float32)))
+        flags, seconds, vertCount, moved, movedCo, toggled, tickLoops = reader.ticks[1]
+        self.assertEqual((flags, len(moved), len(toggled), tickLoops), (TRACE_REINIT | TRACE_LOOPS, 0, 0, loops[:1]))
+
+    def testNotATrace(self):
+        fd, path = tempfile.mkstemp()
+        os.write(fd, b"not a trace")
+        os.close(fd)
+        try:
+            self.assertRaises(ValueError, TraceReader, path)
+        finally:
+            os.remove(path)
+
+if __name__ == "__main__":
+    unittest.main()